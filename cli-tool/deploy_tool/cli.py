@@ -1,4 +1,5 @@
 import click
+import importlib
 import sys
 from pathlib import Path
 from colorama import init, Fore, Style
@@ -20,15 +21,57 @@ except ImportError:
     def print_error(message: str):
         click.echo(f"[ERROR] {message}")
 
-from .commands.init import init
-from .commands.deploy import deploy
-from .commands.rollback import rollback
-from .commands.status import status
-from .commands.versions import versions
-from .commands.monitoring import monitoring  
-from .commands.config import config
+# Command modules are imported on dispatch: name -> (module, attribute, short help).
+# The help text lives here so '--help' does not import boto3 through the modules.
+LAZY_COMMANDS = {
+    'init': ('deploy_tool.commands.init', 'init', 'Initialize a new project for deployment'),
+    'deploy': ('deploy_tool.commands.deploy', 'deploy', 'Deploy project to S3 (one-button deployment)'),
+    'rollback': ('deploy_tool.commands.rollback', 'rollback', 'Rollback to a previous version (instant, no rebuild)'),
+    'status': ('deploy_tool.commands.status', 'status', 'Show project deployment status and information'),
+    'versions': ('deploy_tool.commands.versions', 'versions', 'Manage project versions'),
+    'monitoring': ('deploy_tool.commands.monitoring', 'monitoring', 'Monitoring server management commands'),
+    'config': ('deploy_tool.commands.config', 'config', 'Configuration management commands'),
+    'cache': ('deploy_tool.commands.cache', 'cache', 'Local dependency and build cache management commands'),
+}
 
-@click.group()
+class LazyGroup(click.Group):
+    """Click group that imports subcommand modules only when they are invoked"""
+    
+    def __init__(self, *args, lazy_commands=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = lazy_commands or {}
+    
+    def list_commands(self, ctx):
+        """Eager and lazy command names"""
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_commands))
+    
+    def get_command(self, ctx, cmd_name):
+        """Resolve a command, importing its module on first use"""
+        command = super().get_command(ctx, cmd_name)
+        if command is not None or cmd_name not in self.lazy_commands:
+            return command
+        
+        module_name, attribute, _ = self.lazy_commands[cmd_name]
+        command = getattr(importlib.import_module(module_name), attribute)
+        self.add_command(command, cmd_name)
+        return command
+    
+    def format_commands(self, ctx, formatter):
+        """List commands using the registered help text, without importing them"""
+        rows = []
+        for name in self.list_commands(ctx):
+            if name in self.lazy_commands and name not in self.commands:
+                rows.append((name, self.lazy_commands[name][2]))
+            else:
+                command = self.get_command(ctx, name)
+                if command is not None and not command.hidden:
+                    rows.append((name, command.get_short_help_str(formatter.width)))
+        
+        if rows:
+            with formatter.section('Commands'):
+                formatter.write_dl(rows)
+
+@click.group(cls=LazyGroup, lazy_commands=LAZY_COMMANDS)
 @click.version_option(version="1.0.0")
 @click.option('--profile', default='Uzaif', help='AWS SSO profile name')
 @click.option('--region', default='ap-south-1', help='AWS region')
@@ -46,6 +89,7 @@ def cli(ctx, profile, region):
     • rollback - Instantly rollback to a previous version
     • versions - List available versions
     • monitoring - Manage monitoring infrastructure
+    • cache   - Inspect and prune local build caches
     
     All caching, optimization, and cleanup happens automatically.
     """
@@ -59,15 +103,6 @@ def cli(ctx, profile, region):
     print_info("DevOps Capstone Project")
     click.echo()
 
-# Register commands
-cli.add_command(init)
-cli.add_command(deploy)
-cli.add_command(rollback)
-cli.add_command(status)
-cli.add_command(versions)
-cli.add_command(monitoring)
-cli.add_command(config)
-
 
 
 if __name__ == '__main__':
@@ -0,0 +1,72 @@
+import click
+from datetime import datetime
+
+from ..core.utils import (
+    print_success, print_error, print_info, print_warning, print_header, format_file_size
+)
+from ..core.cache_manager import CacheManager
+from ..config.constants import CACHE_LIMITS
+
+@click.group()
+def cache():
+    """Local dependency and build cache management commands"""
+    pass
+
+@cache.command('list')
+def list_entries():
+    """Show cache entries and sizes"""
+    try:
+        for name, max_bytes in CACHE_LIMITS.items():
+            cache_manager = CacheManager(name, max_bytes)
+            entries = cache_manager.entries()
+            total = sum(entry.get('size', 0) for entry in entries)
+
+            print_header(f"{name.upper()} CACHE")
+            print_info(f"Location: {cache_manager.cache_dir}")
+            print_info(f"Size: {format_file_size(total)} / {format_file_size(max_bytes)} ({len(entries)} entries)")
+
+            for entry in entries:
+                last_used = datetime.fromtimestamp(entry.get('last_used', 0)).strftime('%Y-%m-%d %H:%M')
+                click.echo(
+                    f"  {entry['key'][:12]}  {format_file_size(entry.get('size', 0)):>9}  "
+                    f"last used {last_used}  hits {entry.get('hits', 0)}"
+                )
+
+    except Exception as e:
+        print_error(f"Failed to list cache: {e}")
+
+@cache.command()
+@click.option('--name', type=click.Choice(list(CACHE_LIMITS)), help='Only prune this cache')
+@click.option('--max-size', type=int, help='Evict down to this size in MB (default: configured limit)')
+@click.option('--all', 'clear_all', is_flag=True, help='Remove every entry')
+def prune(name, max_size, clear_all):
+    """Evict least recently used cache entries
+
+    Example: deploy-tool cache prune --max-size 500
+    Example: deploy-tool cache prune --name builds --all
+    """
+    try:
+        names = [name] if name else list(CACHE_LIMITS)
+        total_removed = 0
+        total_freed = 0
+
+        for cache_name in names:
+            cache_manager = CacheManager(cache_name, CACHE_LIMITS[cache_name])
+
+            if clear_all:
+                removed, freed = cache_manager.clear()
+            elif max_size is not None:
+                removed, freed = cache_manager.evict(max_size * 1024 * 1024)
+            else:
+                removed, freed = cache_manager.evict()
+
+            total_removed += removed
+            total_freed += freed
+
+        if total_removed:
+            print_success(f"Removed {total_removed} cache entries ({format_file_size(total_freed)})")
+        else:
+            print_warning("Nothing to prune")
+
+    except Exception as e:
+        print_error(f"Failed to prune cache: {e}")
@@ -7,6 +7,7 @@ from ..core.utils import (
     print_success, print_error, print_info, print_warning, print_step, print_header
 )
 from ..core.config_manager import ConfigManager
+from ..config.constants import DEFAULT_UPLOAD_CONCURRENCY, DEFAULT_ACTIVATION_MODE, DEFAULT_COMPRESSION
 
 @click.group()
 def config():
@@ -48,11 +49,22 @@ def show(show_all):
             print_info(f"Install Command: {config['build'].get('install_command', 'npm ci')}")
             print_info(f"Build Command: {config['build'].get('build_command', 'npm run build')}")
             print_info(f"Output Directory: {config['build'].get('output_dir', 'dist')}")
+            print_info(f"Optimize Images: {config['build'].get('optimize_images', False)}")
         
         if 'deployment' in config:
             print_header("DEPLOYMENT CONFIGURATION")
             print_info(f"Auto Cleanup: {config['deployment'].get('auto_cleanup', False)}")
             print_info(f"Versions to Keep: {config['deployment'].get('versions_to_keep', 10)}")
+            print_info(f"Upload Concurrency: {config['deployment'].get('upload_concurrency', DEFAULT_UPLOAD_CONCURRENCY)}")
+            print_info(f"Activation Mode: {config['deployment'].get('activation_mode', DEFAULT_ACTIVATION_MODE)}")
+            print_info(f"Pipelined Upload: {config['deployment'].get('pipeline', False)}")
+            
+            compression = dict(DEFAULT_COMPRESSION, **config['deployment'].get('compression', {}))
+            if compression['enabled']:
+                brotli = f", brotli quality {compression['brotli_quality']}" if compression['brotli'] else ""
+                print_info(f"Compression: gzip level {compression['gzip_level']}{brotli}")
+            else:
+                print_info("Compression: disabled")
             
         if show_all:
             print_header("FULL CONFIGURATION")
@@ -9,18 +9,30 @@ from ..core.config_manager import ConfigManager
 from ..core.git_manager import GitManager
 from ..core.build_manager import BuildManager
 from ..core.aws_manager import AWSManager
+from ..core.client_manager import clear_cache, is_expired_credentials_error
+from ..config.constants import (
+    DEFAULT_UPLOAD_CONCURRENCY, MAX_UPLOAD_CONCURRENCY, DEFAULT_ACTIVATION_MODE
+)
 
 @click.command()
 @click.option('--version', help='Version tag (auto-generated if not provided)')
 @click.option('--build-only', is_flag=True, help='Only build, do not deploy')
+@click.option('--jobs', '-j', type=click.IntRange(1, MAX_UPLOAD_CONCURRENCY),
+              help='Concurrent S3 uploads (default: deployment.upload_concurrency)')
+@click.option('--force', is_flag=True, help='Deploy even if the remote commit is already live')
+@click.option('--pipeline/--no-pipeline', default=None,
+              help='Overlap HTML fixes with S3 upload (default: deployment.pipeline)')
 @click.pass_context
-def deploy(ctx, version, build_only):
+def deploy(ctx, version, build_only, jobs, force, pipeline):
     """
     Deploy project to S3 (one-button deployment)
     Automatic cleanup - no user maintenance required
     
     Example: deploy-tool deploy
     Example: deploy-tool deploy --version v1.2.0
+    Example: deploy-tool deploy --jobs 16
+    Example: deploy-tool deploy --force
+    Example: deploy-tool deploy --pipeline
     """
     try:
         print_step("DEPLOY", "Starting deployment process...")
@@ -39,7 +51,8 @@ def deploy(ctx, version, build_only):
         build_manager = BuildManager()
         aws_manager = AWSManager(
             profile=config['aws']['profile'],
-            region=config['aws']['region']
+            region=config['aws']['region'],
+            endpoint_url=config['aws'].get('endpoint_url')
         )
         
         # Validate AWS credentials
@@ -50,9 +63,25 @@ def deploy(ctx, version, build_only):
             sys.exit(1)
         
         # Generate version if not provided
-        if not version:
+        version_generated = not version
+        if version_generated:
             version = f"v{datetime.now().strftime('%Y%m%d-%H%M%S')}"
         
+        # Build env, build settings and compression change the output without a new commit
+        deploy_inputs = build_manager.deploy_inputs_hash(
+            config.get('build'), config.get('deployment', {}).get('compression')
+        )
+        
+        # Nothing to do if the remote HEAD is the commit that is already live, built the same way;
+        # an explicit version (re-tag, promotion) still deploys, from the build cache
+        if not force and not build_only and version_generated:
+            remote_commit = git_manager.get_remote_head(config['project']['github_url'])
+            deployed_commit, deployed_inputs = _get_deployed_commit(config, aws_manager)
+            if remote_commit and remote_commit == deployed_commit and deploy_inputs == deployed_inputs:
+                print_success(f"Already up to date: {config['project']['current_version']} ({remote_commit[:12]})")
+                print_info("Use --force to deploy anyway")
+                return
+        
         print_info(f"Deploying version: {version}")
         
         # Step 1: Get repository
@@ -62,39 +91,77 @@ def deploy(ctx, version, build_only):
             config['project']['name']
         )
         
-        # Step 2: Build project (automatic cleanup scheduled)
-        print_step("2/4", "Building project...")
-        build_output, build_info = build_manager.build_and_prepare_for_deployment(repo_dir)
-        
-        if build_only:
-            print_success("Build completed successfully")
-            print_info(f"Framework: {build_info['framework']}")
-            print_info(f"Files: {build_info['total_files']}")
-            print_info(f"Size: {build_info['total_size_formatted']}")
-            return
-        
-        # Step 3: Deploy to S3 (S3 configuration happens automatically in deploy_version)
-        print_step("3/4", "Deploying to S3...")
-        deployment_info = aws_manager.deploy_version(
-            config['project']['name'],
-            version,
-            build_output
-        )
-        
-        # Step 4: Activate version
-        print_step("4/4", "Activating new version...")
-        activation_info = aws_manager.activate_version(config['project']['name'], version)
-        
-        # Update configuration
-        config['project']['current_version'] = version
-        config['project']['last_deployed'] = datetime.now().isoformat()
-        config_manager.save_config(config)
-        
-        # Success! (Cleanup happens automatically in background)
-        print_success("Deployment completed successfully!")
-        print_info(f"Version: {version}")
-        print_info(f"Live URL: {activation_info['website_url']}")
-        print_info(f"Deployed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        # The clone is removed only after upload, caching and activation are done:
+        # pipelined deploys still read and fix HTML in it during the upload
+        try:
+            # Pipelined deploys leave HTML fixes to the upload workers
+            if pipeline is None:
+                pipeline = config.get('deployment', {}).get('pipeline', False)
+            pipeline = pipeline and not build_only
+            
+            # Step 2: Build project
+            print_step("2/4", "Building project...")
+            build_output, build_info = build_manager.build_and_prepare_for_deployment(
+                repo_dir,
+                build_config=config.get('build'),
+                defer_html_fixes=pipeline
+            )
+            build_info['deploy_inputs'] = deploy_inputs
+            
+            if build_only:
+                print_success("Build completed successfully")
+                print_info(f"Framework: {build_info['framework']}")
+                print_info(f"Files: {build_info['total_files']}")
+                print_info(f"Size: {build_info['total_size_formatted']}")
+                print_info(f"Output: {build_output}")
+                return
+            
+            # Step 3: Deploy to S3 (S3 configuration happens automatically in deploy_version)
+            print_step("3/4", "Deploying to S3...")
+            upload_concurrency = jobs or config.get('deployment', {}).get(
+                'upload_concurrency', DEFAULT_UPLOAD_CONCURRENCY
+            )
+            deployment_info = aws_manager.deploy_version(
+                config['project']['name'],
+                version,
+                build_output,
+                concurrency=upload_concurrency,
+                previous_version=config['project'].get('current_version'),
+                build_info=build_info,
+                pipeline=pipeline,
+                html_transform=build_manager.fix_deferred_file if build_info.get('html_fixes_deferred') else None,
+                inventory=build_manager.inventory,
+                compression=config.get('deployment', {}).get('compression')
+            )
+            
+            if build_info.get('html_fixes_deferred'):
+                build_manager.cache_build_output(build_output, build_info)
+            
+            # Step 4: Activate version
+            print_step("4/4", "Activating new version...")
+            activation_info = aws_manager.activate_version(
+                config['project']['name'],
+                version,
+                concurrency=upload_concurrency,
+                mode=config.get('deployment', {}).get('activation_mode', DEFAULT_ACTIVATION_MODE)
+            )
+            
+            # Update configuration
+            config['project']['current_version'] = version
+            config['project']['current_commit'] = build_info.get('commit')
+            config['project']['current_deploy_inputs'] = deploy_inputs
+            config['project']['last_deployed'] = datetime.now().isoformat()
+            config_manager.save_config(config)
+            
+            # Success!
+            print_success("Deployment completed successfully!")
+            print_info(f"Version: {version}")
+            print_info(f"Live URL: {activation_info['website_url']}")
+            print_info(f"Deployed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        finally:
+            # Build-only runs keep the clone so the output can be inspected
+            if not build_only:
+                build_manager.cleanup_repository(repo_dir)
         
     except KeyboardInterrupt:
         print_warning("Deployment interrupted by user")
@@ -102,9 +169,29 @@ def deploy(ctx, version, build_only):
         
     except Exception as e:
         print_error(f"Deployment failed: {str(e)}")
+        if is_expired_credentials_error(e):
+            # The session expired mid-run (the cached identity is trusted for a few minutes)
+            clear_cache()
+            print_info(f"AWS SSO session expired, please run: aws sso login --profile {config['aws']['profile']}")
         sys.exit(1)
 
 
+def _get_deployed_commit(config, aws_manager):
+    """(commit, deploy inputs hash) of the live version from config, falling back to its S3 manifest"""
+    project = config['project']
+    if not project.get('current_version'):
+        return None, None
+    if project.get('current_commit'):
+        return project['current_commit'], project.get('current_deploy_inputs')
+    
+    try:
+        manifest = aws_manager.load_manifest(project['name'], project['current_version'])
+        build = (manifest or {}).get('build', {})
+        return build.get('commit'), build.get('deploy_inputs')
+    except Exception:
+        return None, None
+
+
 
 
 
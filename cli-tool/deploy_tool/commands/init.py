@@ -11,6 +11,7 @@ from ..core.config_manager import ConfigManager
 from ..core.git_manager import GitManager
 from ..core.aws_manager import AWSManager
 from ..core.build_manager import BuildManager
+from ..config.constants import DEFAULT_UPLOAD_CONCURRENCY, DEFAULT_ACTIVATION_MODE, DEFAULT_COMPRESSION
 
 @click.command()
 @click.option('--github-url', required=True, help='GitHub repository URL')
@@ -61,6 +62,9 @@ def init(ctx, github_url, project_name, framework, environment):
             sys.exit(1)
         print_success("AWS credentials validated")
         
+        # Verify bucket website hosting up front (deploys then use the cached result)
+        aws_manager.ensure_website_hosting(force=True)
+        
         # Clone repository temporarily to detect framework
         print_step("CLONE", "Cloning repository to detect project type...")
         temp_dir = git_manager.clone_repository(github_url)
@@ -114,11 +118,16 @@ def init(ctx, github_url, project_name, framework, environment):
             "build": {
                 "output_dir": output_dir,
                 "build_command": "npm run build",
-                "install_command": "npm ci"
+                "install_command": "npm ci",
+                "optimize_images": False
             },
             "deployment": {
                 "versions_to_keep": 10,
-                "auto_cleanup": True
+                "auto_cleanup": True,
+                "upload_concurrency": DEFAULT_UPLOAD_CONCURRENCY,
+                "activation_mode": DEFAULT_ACTIVATION_MODE,
+                "pipeline": False,
+                "compression": dict(DEFAULT_COMPRESSION)
             }
         }
         
@@ -1,17 +1,18 @@
 import click
-import boto3
 import json
 import time
 import sys
 import subprocess
 import os
 from pathlib import Path
-import requests
-from botocore.exceptions import ClientError
 
 from ..core.utils import (
     print_success, print_error, print_info, print_warning, print_step, print_header
 )
+from ..core.client_manager import get_client
+
+# botocore/requests are imported inside the commands that use them
+# so they stay off the CLI startup path
 
 # Monitoring configuration
 MONITORING_INSTANCE_ID = "i-097272e2689b6c0eb"
@@ -27,12 +28,12 @@ def monitoring():
 @monitoring.command()
 def start():
     """Start monitoring server and containers"""
+    from botocore.exceptions import ClientError
     try:
         print_step("MONITORING", "Starting monitoring server...")
         
         # Initialize AWS client with explicit profile
-        session = boto3.Session(profile_name=AWS_PROFILE)
-        ec2 = session.client('ec2', region_name=AWS_REGION)
+        ec2 = get_client('ec2', AWS_PROFILE, AWS_REGION)
         
         # Check current state
         response = ec2.describe_instances(InstanceIds=[MONITORING_INSTANCE_ID])
@@ -121,12 +122,12 @@ def start():
 @monitoring.command()
 def stop():
     """Stop monitoring containers and server"""
+    from botocore.exceptions import ClientError
     try:
         print_step("MONITORING", "Stopping monitoring...")
         
         # Initialize AWS client
-        session = boto3.Session(profile_name=AWS_PROFILE)
-        ec2 = session.client('ec2', region_name=AWS_REGION)
+        ec2 = get_client('ec2', AWS_PROFILE, AWS_REGION)
         
         # Get current instance info
         response = ec2.describe_instances(InstanceIds=[MONITORING_INSTANCE_ID])
@@ -171,12 +172,12 @@ def stop():
 @monitoring.command()
 def status():
     """Check monitoring server status"""
+    from botocore.exceptions import ClientError
     try:
         print_step("MONITORING", "Checking server status...")
         
         # Initialize AWS client
-        session = boto3.Session(profile_name=AWS_PROFILE)
-        ec2 = session.client('ec2', region_name=AWS_REGION)
+        ec2 = get_client('ec2', AWS_PROFILE, AWS_REGION)
         
         response = ec2.describe_instances(InstanceIds=[MONITORING_INSTANCE_ID])
         instance = response['Reservations'][0]['Instances'][0]
@@ -226,10 +227,10 @@ def status():
 @monitoring.command()
 def urls():
     """Get monitoring service URLs"""
+    from botocore.exceptions import ClientError
     try:
         # Initialize AWS client
-        session = boto3.Session(profile_name=AWS_PROFILE)
-        ec2 = session.client('ec2', region_name=AWS_REGION)
+        ec2 = get_client('ec2', AWS_PROFILE, AWS_REGION)
         
         response = ec2.describe_instances(InstanceIds=[MONITORING_INSTANCE_ID])
         instance = response['Reservations'][0]['Instances'][0]
@@ -282,10 +283,10 @@ def urls():
 @monitoring.command()
 def dashboard():
     """Open Grafana dashboard in browser"""
+    import requests
     try:
         # Initialize AWS client
-        session = boto3.Session(profile_name=AWS_PROFILE)
-        ec2 = session.client('ec2', region_name=AWS_REGION)
+        ec2 = get_client('ec2', AWS_PROFILE, AWS_REGION)
         
         response = ec2.describe_instances(InstanceIds=[MONITORING_INSTANCE_ID])
         instance = response['Reservations'][0]['Instances'][0]
@@ -323,10 +324,10 @@ def dashboard():
 @monitoring.command()
 def discovered():
     """List auto-discovered applications"""
+    import requests
     try:
         # Get monitoring config
-        session = boto3.Session(profile_name=AWS_PROFILE)
-        ec2 = session.client('ec2', region_name=AWS_REGION)
+        ec2 = get_client('ec2', AWS_PROFILE, AWS_REGION)
         
         response = ec2.describe_instances(InstanceIds=[MONITORING_INSTANCE_ID])
         instance = response['Reservations'][0]['Instances'][0]
@@ -407,8 +408,7 @@ def discovered():
 def logs():
     """View monitoring service logs"""
     try:
-        session = boto3.Session(profile_name=AWS_PROFILE)
-        ec2 = session.client('ec2', region_name=AWS_REGION)
+        ec2 = get_client('ec2', AWS_PROFILE, AWS_REGION)
         
         response = ec2.describe_instances(InstanceIds=[MONITORING_INSTANCE_ID])
         instance = response['Reservations'][0]['Instances'][0]
@@ -509,6 +509,7 @@ def stop_containers_via_ssh(public_ip):
 
 def check_container_status(public_ip):
     """Check status of monitoring containers"""
+    import requests
     services = {
         'Grafana': 3000,
         'Prometheus': 9090,
@@ -1,9 +1,11 @@
 import click
 import sys
 
-from ..core.utils import print_success, print_error, print_info, print_step
+from ..core.utils import print_success, print_error, print_info, print_step, format_file_size
 from ..core.config_manager import ConfigManager
 from ..core.aws_manager import AWSManager
+from ..core.client_manager import clear_cache, is_expired_credentials_error
+from ..config.constants import DEFAULT_UPLOAD_CONCURRENCY, DEFAULT_ACTIVATION_MODE
 
 @click.command()
 @click.option('--version', required=True, help='Version to rollback to')
@@ -24,7 +26,8 @@ def rollback(ctx, version):
         # Initialize AWS manager
         aws_manager = AWSManager(
             profile=config['aws']['profile'],
-            region=config['aws']['region']
+            region=config['aws']['region'],
+            endpoint_url=config['aws'].get('endpoint_url')
         )
         
         # Validate credentials
@@ -34,22 +37,33 @@ def rollback(ctx, version):
             print_info(f"Please run: aws sso login --profile {config['aws']['profile']}")
             sys.exit(1)
         
-        # Check if version exists
+        # Check if version exists (manifest first, listing for older versions)
         print_step("VALIDATE", "Checking version availability...")
-        available_versions = aws_manager.list_versions(config['project']['name'])
-        if version not in available_versions:
-            print_error(f"Version '{version}' not found")
-            print_info("Available versions:")
-            for v in sorted(available_versions, reverse=True):
-                print_info(f"  - {v}")
-            sys.exit(1)
+        manifest = aws_manager.load_manifest(config['project']['name'], version)
+        if manifest:
+            print_info(f"Version {version}: {manifest['file_count']} files ({format_file_size(manifest['total_size'])})")
+        else:
+            available_versions = aws_manager.list_versions(config['project']['name'])
+            if version not in available_versions:
+                print_error(f"Version '{version}' not found")
+                print_info("Available versions:")
+                for v in sorted(available_versions, reverse=True):
+                    print_info(f"  - {v}")
+                sys.exit(1)
         
         # Perform rollback
         print_step("ACTIVATE", "Activating previous version...")
-        rollback_info = aws_manager.activate_version(config['project']['name'], version)
+        rollback_info = aws_manager.activate_version(
+            config['project']['name'],
+            version,
+            concurrency=config.get('deployment', {}).get('upload_concurrency', DEFAULT_UPLOAD_CONCURRENCY),
+            mode=config.get('deployment', {}).get('activation_mode', DEFAULT_ACTIVATION_MODE)
+        )
         
         # Update configuration
         config['project']['current_version'] = version
+        config['project']['current_commit'] = (manifest or {}).get('build', {}).get('commit')
+        config['project']['current_deploy_inputs'] = (manifest or {}).get('build', {}).get('deploy_inputs')
         config_manager.save_config(config)
         
         print_success("Rollback completed successfully")
@@ -58,4 +72,8 @@ def rollback(ctx, version):
         
     except Exception as e:
         print_error(f"Rollback failed: {str(e)}")
+        if is_expired_credentials_error(e):
+            # The session expired mid-run (the cached identity is trusted for a few minutes)
+            clear_cache()
+            print_info(f"AWS SSO session expired, please run: aws sso login --profile {config['aws']['profile']}")
         sys.exit(1)
@@ -2,7 +2,7 @@ import click
 import sys
 from colorama import Fore, Style
 
-from ..core.utils import print_error, print_info, print_header
+from ..core.utils import print_error, print_info, print_header, format_file_size
 from ..core.config_manager import ConfigManager
 from ..core.aws_manager import AWSManager
 
@@ -25,7 +25,8 @@ def status(ctx):
         # Initialize AWS manager
         aws_manager = AWSManager(
             profile=config['aws']['profile'],
-            region=config['aws']['region']
+            region=config['aws']['region'],
+            endpoint_url=config['aws'].get('endpoint_url')
         )
         
         # Get project status
@@ -42,8 +43,17 @@ def status(ctx):
         print_info(f"Region:           {config['aws']['region']}")
         print_info(f"Current Version:  {config['project'].get('current_version', 'None')}")
         print_info(f"Live URL:         {project_info.get('website_url', 'Not deployed')}")
+        if project_info.get('activation_mode'):
+            print_info(f"Activation Mode:  {project_info['activation_mode']}")
         print_info(f"Created:          {config['project']['created_at']}")
         
+        # Version details come from its manifest - one GET instead of a listing
+        current_version = config['project'].get('current_version')
+        manifest = aws_manager.load_manifest(config['project']['name'], current_version) if current_version else None
+        if manifest:
+            print_info(f"Files:            {manifest['file_count']} ({format_file_size(manifest['total_size'])})")
+            print_info(f"Built:            {manifest['created_at']}")
+        
         click.echo()
         print_header("AVAILABLE VERSIONS")
         
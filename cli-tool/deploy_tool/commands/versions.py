@@ -26,7 +26,8 @@ def versions(ctx, list, cleanup, keep):
         # Initialize AWS manager
         aws_manager = AWSManager(
             profile=config['aws']['profile'],
-            region=config['aws']['region']
+            region=config['aws']['region'],
+            endpoint_url=config['aws'].get('endpoint_url')
         )
         
         if list:
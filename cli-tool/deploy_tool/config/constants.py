@@ -7,6 +7,11 @@ INFRASTRUCTURE_BUCKET = "minfy-uzaif-capstone-deployments"
 
 # File Configuration
 CONFIG_FILE = ".deploy-config.json"
+WORKSPACE_DIR_NAME = "deploy-workspace"  # under the system temp directory
+MANIFEST_FILE = ".deploy-manifest.json"  # stored under {project}/builds/{version}/
+# build_info fields kept in the manifest; it is publicly readable, so no local paths or timings
+MANIFEST_BUILD_FIELDS = ["framework", "commit", "deploy_inputs", "total_files", "total_size_formatted"]
+POINTER_FILE = "current.json"  # stored under {project}/
 TEMP_DIR_PREFIX = "deploy-tool-"
 
 # Supported Frameworks
@@ -34,6 +39,73 @@ FRAMEWORK_DETECTION = {
     }
 }
 
+# Activation Modes
+# copy    - sync the version into {project}/current/
+# pointer - redirect {project}/current/ to the version prefix (no object copies)
+ACTIVATION_MODES = ["copy", "pointer"]
+DEFAULT_ACTIVATION_MODE = "copy"
+MAX_ROUTING_RULES = 50  # S3 website configuration limit
+WEBSITE_LOCK_KEY = ".deploy-locks/website-config.lock"  # serialises routing rule updates across deploys
+WEBSITE_LOCK_TIMEOUT = 60  # seconds to wait for another deploy's routing update
+WEBSITE_LOCK_STALE_SECONDS = 120  # a lock older than this was left by a crashed deploy
+WEBSITE_UPDATE_ATTEMPTS = 3  # routing rule writes re-applied if a concurrent update dropped them
+
+# Local Cache Configuration
+DEPENDENCY_CACHE_MAX_BYTES = 3 * 1024 ** 3  # 3GB of node_modules snapshots
+DEPENDENCY_LOCK_FILES = ["package-lock.json", "npm-shrinkwrap.json", "yarn.lock", "pnpm-lock.yaml"]
+DEPENDENCY_CACHE_EXCLUDES = [".cache", ".vite"]  # tool caches mutated in place during builds
+BUILD_CACHE_MAX_BYTES = 2 * 1024 ** 3  # 2GB of build outputs
+BUILD_ENV_PREFIXES = ["VITE_", "REACT_APP_", "NEXT_PUBLIC_", "PUBLIC_URL", "NODE_ENV"]
+MIRROR_CACHE_MAX_BYTES = 2 * 1024 ** 3  # 2GB of bare repository mirrors
+MIRROR_MAX_AGE_DAYS = 30  # mirrors unused for longer are removed
+IMAGE_CACHE_MAX_BYTES = 512 * 1024 ** 2  # 512MB of optimized images
+
+# Caches shown and pruned by 'deploy-tool cache'
+CACHE_LIMITS = {
+    "dependencies": DEPENDENCY_CACHE_MAX_BYTES,
+    "builds": BUILD_CACHE_MAX_BYTES,
+    "mirrors": MIRROR_CACHE_MAX_BYTES,
+    "images": IMAGE_CACHE_MAX_BYTES
+}
+
 # Docker Configuration
 DOCKER_NODE_IMAGE = "node:18-alpine"
 DOCKER_BUILD_TIMEOUT = 600  # 10 minutes
+
+# Upload Configuration
+DEFAULT_UPLOAD_CONCURRENCY = 8
+MAX_UPLOAD_CONCURRENCY = 64
+TRANSFER_MAX_RETRIES = 3
+TRANSFER_RETRY_BACKOFF = 0.5  # seconds, doubled on every retry
+TRANSFER_PROGRESS_INTERVAL = 2  # seconds between progress lines
+
+# Asset Path Rewriting
+REWRITE_PARALLEL_THRESHOLD = 32  # below this many files the pool costs more than it saves
+REWRITE_REPORT_SLOWEST = 5  # slowest files listed in the rewrite report
+REWRITE_CHUNK_SIZE = 1024 * 1024  # CSS/JS are rewritten in chunks of this size
+REWRITE_MAX_TOKEN = 1024  # longest path reference matched; also the chunk overlap
+REWRITTEN_CACHE_CONTROL = "public, max-age=0, must-revalidate"  # rewritten CSS/JS no longer match their fingerprint
+
+# Compression Configuration (deployment.compression in .deploy-config.json)
+COMPRESSIBLE_SUFFIXES = [".html", ".css", ".js", ".mjs", ".json", ".svg", ".txt", ".xml", ".map", ".ico", ".wasm"]
+DEFAULT_COMPRESSION = {
+    "enabled": False,
+    "gzip_level": 9,
+    "brotli": False,  # .br sidecar objects, needs the optional 'brotli' package
+    "brotli_quality": 11,
+    "min_size": 1024,  # bytes; smaller files are not worth an extra header
+    "max_ratio": 0.9  # keep a variant only if it is at most 90% of the original
+}
+COMPRESSION_PARALLEL_THRESHOLD = 8  # compress in worker processes from this many files
+
+# Image Optimization (build.optimize_images in .deploy-config.json)
+IMAGE_OPTIMIZER_VERSION = 3  # bump to invalidate cached results when settings change
+IMAGE_OPTIMIZE_WORKERS = 4
+IMAGE_OPTIMIZE_TIMEOUT = 60  # seconds per image
+
+# Bucket Setup
+BUCKET_STATE_TTL_HOURS = 6  # re-verify website/policy configuration after this long
+
+# AWS Client Pooling
+CLIENT_POOL_SIZES = {"s3": MAX_UPLOAD_CONCURRENCY}  # max_pool_connections per service (botocore default: 10)
+STS_IDENTITY_TTL = 300  # seconds a verified caller identity is trusted
@@ -1,143 +1,477 @@
-import boto3
-from botocore.exceptions import ClientError, NoCredentialsError
+from botocore.exceptions import ClientError
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import hashlib
 import mimetypes
 import json
+import random
+import tempfile
+import time
+import uuid
 
 from .utils import (
     print_info, print_error, print_warning, print_success, print_step,
-    format_file_size, get_directory_size
+    format_file_size, hash_file, FileEntry, iter_tree, scan_tree
+)
+from .client_manager import get_session, get_client, get_caller_identity, clear_cache, is_expired_credentials_error
+from .transfer_manager import TransferManager, TransferProgress, TransferTask
+from .compression_manager import CompressionManager, CompressedVariant
+from ..config.constants import (
+    INFRASTRUCTURE_BUCKET, MANIFEST_FILE, MANIFEST_BUILD_FIELDS, POINTER_FILE, DEFAULT_UPLOAD_CONCURRENCY,
+    ACTIVATION_MODES, DEFAULT_ACTIVATION_MODE, MAX_ROUTING_RULES,
+    WEBSITE_LOCK_KEY, WEBSITE_LOCK_TIMEOUT, WEBSITE_LOCK_STALE_SECONDS, WEBSITE_UPDATE_ATTEMPTS,
+    REWRITTEN_CACHE_CONTROL, WORKSPACE_DIR_NAME, BUCKET_STATE_TTL_HOURS
 )
-from ..config.constants import INFRASTRUCTURE_BUCKET
 
 class AWSManager:
     """Enhanced S3 manager with proper website hosting configuration"""
     
-    def __init__(self, profile: str, region: str):
+    def __init__(self, profile: str, region: str, endpoint_url: Optional[str] = None):
         self.profile = profile
         self.region = region
+        self.endpoint_url = endpoint_url  # local S3 stand-in (e.g. moto, MinIO)
         self.bucket_name = INFRASTRUCTURE_BUCKET
         self.session = None
         self.s3_client = None
         self._initialize_session()
-        self._setup_website_hosting()
     
     def _initialize_session(self) -> None:
         """Initialize AWS session"""
         try:
-            self.session = boto3.Session(profile_name=self.profile)
-            self.s3_client = self.session.client('s3', region_name=self.region)
+            # Shared per process; the s3 pool is sized for concurrent upload workers
+            self.session = get_session(self.profile)
+            self.s3_client = get_client('s3', self.profile, self.region, self.endpoint_url)
         except Exception as e:
             raise Exception(f"Failed to initialize AWS session: {str(e)}")
     
     def validate_credentials(self) -> bool:
         """Validate AWS credentials"""
         try:
-            sts = self.session.client('sts')
-            identity = sts.get_caller_identity()
+            if self.endpoint_url:
+                # Local S3 stand-ins have no STS; any authenticated S3 call proves the credentials
+                self.s3_client.list_buckets()
+                print_info(f"Using S3 endpoint: {self.endpoint_url}")
+                return True
+            
+            identity = get_caller_identity(self.profile, self.region)
             print_info(f"Authenticated as: {identity.get('Arn', 'Unknown')}")
             return True
-        except (ClientError, NoCredentialsError):
-            return False
-        except Exception:
+        except Exception as e:
+            if is_expired_credentials_error(e):
+                # Nothing cached may outlive the session; 'aws sso login' starts afresh
+                clear_cache()
             return False
     
-    def _setup_website_hosting(self) -> None:
-        """Setup S3 bucket for static website hosting"""
+    def ensure_website_hosting(self, force: bool = False) -> None:
+        """Make sure the bucket serves websites publicly, writing only what differs
+        
+        Verified state is remembered locally for BUCKET_STATE_TTL_HOURS so
+        repeated deploys skip even the reads. Only write paths call this.
+        """
+        marker = self._bucket_state_marker()
+        if not force and self._bucket_state_fresh(marker):
+            return
+        
         try:
-            # Configure static website hosting
-            self.s3_client.put_bucket_website(
-                Bucket=self.bucket_name,
-                WebsiteConfiguration={
-                    'IndexDocument': {'Suffix': 'index.html'},
-                    'ErrorDocument': {'Key': 'index.html'}
-                }
-            )
-            
-            # Set public read policy
-            policy = {
-                "Version": "2012-10-17",
-                "Statement": [
-                    {
-                        "Sid": "PublicReadGetObject",
-                        "Effect": "Allow",
-                        "Principal": "*",
-                        "Action": "s3:GetObject",
-                        "Resource": f"arn:aws:s3:::{self.bucket_name}/*"
-                    }
-                ]
-            }
-            
-            self.s3_client.put_bucket_policy(
-                Bucket=self.bucket_name,
-                Policy=json.dumps(policy)
-            )
+            # Website hosting, keeping pointer-mode routing rules
+            with self._website_lock():
+                website = self._get_website_configuration()
+                desired = self._website_configuration(website.get('RoutingRules', []) if website else [])
+                if not website or any(website.get(field) != desired[field] for field in ('IndexDocument', 'ErrorDocument')):
+                    self.s3_client.put_bucket_website(Bucket=self.bucket_name, WebsiteConfiguration=desired)
+            
+            # Public read policy
+            if not self._has_public_read_policy():
+                self.s3_client.put_bucket_policy(
+                    Bucket=self.bucket_name,
+                    Policy=json.dumps(self._public_read_policy())
+                )
             
-            # Ensure public access block is disabled for website hosting
-            try:
+            # Public access block must be off for website hosting
+            if self._public_access_blocked():
                 self.s3_client.delete_public_access_block(Bucket=self.bucket_name)
-            except:
-                pass  # May not exist
+            
+            marker.parent.mkdir(parents=True, exist_ok=True)
+            marker.write_text(json.dumps({'bucket': self.bucket_name, 'verified_at': time.time()}))
             
         except Exception:
-            pass  # Silent setup
+            pass  # Silent setup; retried on the next write since no marker was saved
+    
+    def _bucket_state_marker(self) -> Path:
+        """Local file recording when this bucket's setup was last verified"""
+        target = f"{self.bucket_name}|{self.region}|{self.endpoint_url or ''}"
+        digest = hashlib.sha256(target.encode('utf-8')).hexdigest()[:16]
+        return Path(tempfile.gettempdir()) / WORKSPACE_DIR_NAME / "state" / f"bucket-{digest}.json"
     
-    def deploy_version(self, project_name: str, version: str, build_dir: Path) -> Dict:
-        """Upload build files to S3 with proper content types"""
+    def _bucket_state_fresh(self, marker: Path) -> bool:
+        """Whether the marker exists and is younger than the TTL"""
+        try:
+            verified_at = json.loads(marker.read_text()).get('verified_at', 0)
+        except (OSError, ValueError):
+            return False
+        return time.time() - verified_at < BUCKET_STATE_TTL_HOURS * 3600
+    
+    def _get_website_configuration(self) -> Optional[Dict]:
+        """Current website configuration (None if website hosting is not configured)"""
+        try:
+            return self.s3_client.get_bucket_website(Bucket=self.bucket_name)
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'NoSuchWebsiteConfiguration':
+                return None
+            raise
+    
+    def _public_read_policy(self) -> Dict:
+        """Bucket policy allowing anonymous reads of every object"""
+        return {
+            "Version": "2012-10-17",
+            "Statement": [
+                {
+                    "Sid": "PublicReadGetObject",
+                    "Effect": "Allow",
+                    "Principal": "*",
+                    "Action": "s3:GetObject",
+                    "Resource": f"arn:aws:s3:::{self.bucket_name}/*"
+                }
+            ]
+        }
+    
+    def _has_public_read_policy(self) -> bool:
+        """Whether the bucket policy already contains the public read statement"""
+        try:
+            policy = json.loads(self.s3_client.get_bucket_policy(Bucket=self.bucket_name)['Policy'])
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'NoSuchBucketPolicy':
+                return False
+            raise
+        
+        expected = self._public_read_policy()['Statement'][0]
+        return any(
+            all(statement.get(field) == value for field, value in expected.items() if field != 'Sid')
+            for statement in policy.get('Statement', [])
+        )
+    
+    def _public_access_blocked(self) -> bool:
+        """Whether any public access block setting is enabled"""
+        try:
+            response = self.s3_client.get_public_access_block(Bucket=self.bucket_name)
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'NoSuchPublicAccessBlockConfiguration':
+                return False
+            raise
+        return any(response.get('PublicAccessBlockConfiguration', {}).values())
+    
+    def _website_configuration(self, routing_rules: List[Dict]) -> Dict:
+        """Build bucket website configuration"""
+        configuration = {
+            'IndexDocument': {'Suffix': 'index.html'},
+            'ErrorDocument': {'Key': 'index.html'}
+        }
+        if routing_rules:
+            configuration['RoutingRules'] = routing_rules
+        return configuration
+    
+    def _get_routing_rules(self) -> List[Dict]:
+        """Get current website routing rules (empty if website hosting is not configured)"""
+        # Any other error must propagate: rewriting the rules from an empty list
+        # would drop every other pointer-mode project's redirect
+        configuration = self._get_website_configuration()
+        return configuration.get('RoutingRules', []) if configuration else []
+    
+    def _website_url(self, project_name: str, pointer_prefix: Optional[str] = None) -> str:
+        """Public URL of the project's current/ prefix
+        
+        REST endpoints (local S3 stand-ins) do not apply website routing rules,
+        so a pointer-mode project is addressed through its version prefix there.
+        """
+        if self.endpoint_url:
+            return f"{self.endpoint_url.rstrip('/')}/{self.bucket_name}/{pointer_prefix or f'{project_name}/current/'}"
+        return f"http://{self.bucket_name}.s3-website.{self.region}.amazonaws.com/{project_name}/current/"
+    
+    def deploy_version(self, project_name: str, version: str, build_dir: Path,
+                       concurrency: Optional[int] = None,
+                       previous_version: Optional[str] = None,
+                       build_info: Optional[Dict] = None,
+                       pipeline: bool = False,
+                       html_transform: Optional[Callable[[Path], None]] = None,
+                       inventory: Optional[Sequence[FileEntry]] = None,
+                       compression: Optional[Dict] = None) -> Dict:
+        """Upload build files to S3, reusing unchanged files from the previous version
+        
+        In pipeline mode the tree is walked lazily and each worker runs
+        transform -> hash -> upload, so immutable assets are uploading while
+        the walk and the (deferred) HTML fixes are still in progress.
+        Pass the build's inventory (see scan_tree) to skip walking the tree again.
+        With compression enabled, compressible files are stored gzip-encoded
+        (plus optional .br sidecars) and uploaded with Content-Encoding.
+        """
+        self.ensure_website_hosting()
+        compressor = CompressionManager(compression) if compression and compression.get('enabled') else None
         try:
             version_prefix = f"{project_name}/builds/{version}/"
+            transfer_manager = TransferManager(concurrency or DEFAULT_UPLOAD_CONCURRENCY)
+            
+            mode = "pipelined" if pipeline else "batch"
+            print_step("UPLOAD", f"Uploading files to S3 ({transfer_manager.concurrency} workers, {mode})...")
+            
+            # Index content of the previous version for server-side reuse
+            reuse_index = self._build_reuse_index(project_name, version, previous_version)
+            if reuse_index:
+                print_info(f"Comparing against {len(reuse_index)} files from previous version")
+            
+            if pipeline:
+                # Totals are unknown until the walk finishes
+                files_to_upload = self._iter_build_files(build_dir, inventory)
+                progress = TransferProgress("Processed")
+            else:
+                # Get all files from build directory
+                files_to_upload = inventory if inventory is not None else scan_tree(build_dir)
+                if not files_to_upload:
+                    raise Exception("No files found in build directory")
+                progress = TransferProgress(
+                    "Processed", len(files_to_upload), sum(entry.size for entry in files_to_upload)
+                )
             
-            print_step("UPLOAD", "Uploading files to S3...")
+            # Rewritten CSS/JS no longer match their fingerprinted names, so they must revalidate
+            rewritten = set(((build_info or {}).get('path_rewrite') or {}).get('rewritten_assets', []))
+            
+            # Compress known files up front in worker processes; files still to be
+            # transformed (or not yet walked) are compressed by their upload worker
+            variants = {}
+            precompressed = set()
+            known = inventory if inventory is not None else (None if pipeline else files_to_upload)
+            if compressor and known is not None:
+                ready = [entry for entry in known if not (html_transform and entry.suffix == '.html')]
+                precompressed = {entry.key for entry in ready}
+                variants = compressor.compress(ready)
+            
+            # Lazy so the pool starts uploading while the walk is still running
+            tasks = (
+                TransferTask(
+                    name=entry.key,
+                    size=entry.size,
+                    action=self._make_upload_action(
+                        entry.path, entry.key, version_prefix, reuse_index, html_transform,
+                        REWRITTEN_CACHE_CONTROL if entry.key in rewritten else None,
+                        variants.get(entry.key, []) if entry.key in precompressed else None,
+                        compressor
+                    )
+                )
+                for entry in files_to_upload
+            )
             
-            # Get all files from build directory
-            files_to_upload = list(build_dir.rglob('*'))
-            files_to_upload = [f for f in files_to_upload if f.is_file()]
+            entries = [entry for results in transfer_manager.run(tasks, progress) for entry in results]
+            summary = progress.summary()
             
-            if not files_to_upload:
+            if not entries:
                 raise Exception("No files found in build directory")
             
-            uploaded_files = 0
-            total_size = 0
+            # Record file hashes so the next deploy can reuse this version
+            self._write_manifest(version_prefix, version, entries, build_info)
             
-            # Upload each file with proper content type and caching
-            for file_path in files_to_upload:
-                relative_path = file_path.relative_to(build_dir)
-                s3_key = f"{version_prefix}{relative_path}".replace('\\', '/')
-                
-                # Get enhanced content type
-                content_type = self._get_enhanced_content_type(file_path)
-                cache_control = self._get_cache_control(file_path)
-                
-                # Upload file
-                self.s3_client.upload_file(
-                    str(file_path),
-                    self.bucket_name,
-                    s3_key,
-                    ExtraArgs={
-                        'ContentType': content_type,
-                        'CacheControl': cache_control
-                    }
-                )
-                
-                uploaded_files += 1
-                total_size += file_path.stat().st_size
-                
-                # Show progress
-                if uploaded_files % 5 == 0:
-                    print_info(f"Uploaded {uploaded_files}/{len(files_to_upload)} files...")
+            uploaded = [e for e in entries if not e['reused']]
+            reused = [e for e in entries if e['reused']]
+            uploaded_bytes = sum(e['size'] for e in uploaded)
+            reused_bytes = sum(e['size'] for e in reused)
+            total_size = uploaded_bytes + reused_bytes
             
-            print_success(f"Uploaded {uploaded_files} files ({format_file_size(total_size)})")
+            print_success(
+                f"Uploaded {len(uploaded)} files ({format_file_size(uploaded_bytes)}), "
+                f"reused {len(reused)} files ({format_file_size(reused_bytes)}) "
+                f"in {summary['elapsed_seconds']}s"
+            )
             
             return {
                 'version': version,
-                'uploaded_files': uploaded_files,
+                'uploaded_files': len(uploaded),
+                'reused_files': len(reused),
+                'uploaded_bytes': uploaded_bytes,
+                'reused_bytes': reused_bytes,
                 'total_size': total_size,
-                'website_url': f"http://{self.bucket_name}.s3-website.{self.region}.amazonaws.com/{project_name}/current/"
+                'upload_seconds': summary['elapsed_seconds'],
+                'pipelined': pipeline,
+                'website_url': self._website_url(project_name)
             }
             
         except Exception as e:
             raise Exception(f"Failed to upload files: {str(e)}")
+        finally:
+            if compressor:
+                compressor.cleanup()
+    
+    def _iter_build_files(self, build_dir: Path,
+                          inventory: Optional[Sequence[FileEntry]] = None) -> Iterator[FileEntry]:
+        """Yield build files with assets first and HTML last
+        
+        HTML is held back so it is fixed and uploaded after the assets it
+        references, which keeps the expensive rewrite off the critical path.
+        """
+        html_files = []
+        for entry in inventory if inventory is not None else iter_tree(build_dir):
+            if entry.suffix == '.html':
+                html_files.append(entry)
+                continue
+            yield entry
+        
+        yield from html_files
+    
+    def _make_upload_action(self, file_path: Path, relative_path: str, version_prefix: str,
+                            reuse_index: Dict,
+                            transform: Optional[Callable[[Path], None]] = None,
+                            cache_control: Optional[str] = None,
+                            variants: Optional[List[CompressedVariant]] = None,
+                            compressor: Optional[CompressionManager] = None):
+        """Create upload callable for a single file and its compressed variants
+        
+        variants=None with a compressor means the file is compressed here,
+        after any transform.
+        """
+        base_args = {
+            'ContentType': self._get_enhanced_content_type(file_path),
+            'CacheControl': cache_control or self._get_cache_control(file_path)
+        }
+        
+        pending_transform = [transform] if transform else []
+        staged = [] if variants is None and compressor else [variants or []]
+        
+        def upload() -> List[Dict]:
+            if pending_transform:
+                # Pipeline stage: finish the file in place before hashing it (once, not per retry)
+                pending_transform.pop()(file_path)
+            if not staged:
+                staged.append(compressor.compress_one(file_path, relative_path))
+            
+            # A gzip variant replaces the original object; others are sidecars
+            gzipped = next((v for v in staged[0] if v.encoding == 'gzip'), None)
+            objects = [(relative_path, gzipped.path if gzipped else file_path, 'gzip' if gzipped else None)]
+            objects += [(v.key, v.path, v.encoding) for v in staged[0] if v.encoding != 'gzip']
+            
+            return [
+                self._upload_object(version_prefix, key, path, encoding, base_args, reuse_index)
+                for key, path, encoding in objects
+            ]
+        
+        return upload
+    
+    def _upload_object(self, version_prefix: str, relative_path: str, file_path: Path,
+                       encoding: Optional[str], base_args: Dict, reuse_index: Dict) -> Dict:
+        """Upload one object, or copy it server-side when identical bytes already exist"""
+        s3_key = f"{version_prefix}{relative_path}"
+        extra_args = dict(base_args)
+        if encoding:
+            extra_args['ContentEncoding'] = encoding
+        
+        file_hash = hash_file(file_path)
+        size = file_path.stat().st_size
+        source_key = reuse_index.get((file_hash, size, encoding))
+        
+        if source_key:
+            # Identical content already in S3 - copy server-side instead of uploading
+            self.s3_client.copy_object(
+                CopySource={'Bucket': self.bucket_name, 'Key': source_key},
+                Bucket=self.bucket_name,
+                Key=s3_key,
+                MetadataDirective='REPLACE',
+                **extra_args
+            )
+        else:
+            self.s3_client.upload_file(str(file_path), self.bucket_name, s3_key, ExtraArgs=extra_args)
+        
+        return {
+            'path': relative_path,
+            'size': size,
+            'hash': file_hash,
+            'content_type': extra_args['ContentType'],
+            'cache_control': extra_args['CacheControl'],
+            'content_encoding': encoding,
+            'reused': bool(source_key)
+        }
+    
+    def _build_reuse_index(self, project_name: str, version: str,
+                           previous_version: Optional[str]) -> Dict:
+        """Map (content hash, size, content encoding) to an existing S3 key of the previous version"""
+        try:
+            if not previous_version or previous_version == version:
+                candidates = [v for v in self.list_versions(project_name) if v != version]
+                if not candidates:
+                    return {}
+                previous_version = candidates[0]
+            
+            previous_prefix = f"{project_name}/builds/{previous_version}/"
+            manifest = self.load_manifest(project_name, previous_version)
+            
+            if manifest:
+                files = manifest.get('files', {})
+                return {
+                    (info['hash'], info['size'], info.get('content_encoding')): f"{previous_prefix}{path}"
+                    for path, info in files.items()
+                }
+            
+            # Older versions have no manifest - single-part ETags are MD5 hashes
+            reuse_index = {}
+            paginator = self.s3_client.get_paginator('list_objects_v2')
+            for page in paginator.paginate(Bucket=self.bucket_name, Prefix=previous_prefix):
+                for obj in page.get('Contents', []):
+                    etag = obj['ETag'].strip('"')
+                    if '-' not in etag:
+                        reuse_index[(etag, obj['Size'], None)] = obj['Key']
+            return reuse_index
+            
+        except Exception as e:
+            print_warning(f"Could not index previous version, uploading everything: {e}")
+            return {}
+    
+    def load_manifest(self, project_name: str, version: str) -> Optional[Dict]:
+        """Load the manifest of a deployed version (None if missing)"""
+        return self._get_json_object(f"{project_name}/builds/{version}/{MANIFEST_FILE}")
+    
+    def load_pointer(self, project_name: str) -> Optional[Dict]:
+        """Load the project's current.json pointer (None if missing)"""
+        return self._get_json_object(f"{project_name}/{POINTER_FILE}")
+    
+    def _get_json_object(self, key: str) -> Optional[Dict]:
+        """Read a small JSON object from the bucket"""
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket_name, Key=key)
+            return json.loads(response['Body'].read())
+        except ClientError as e:
+            if e.response['Error']['Code'] in ('NoSuchKey', '404'):
+                return None
+            raise
+    
+    def _write_manifest(self, version_prefix: str, version: str, entries: List[Dict],
+                        build_info: Optional[Dict] = None) -> None:
+        """Write the version manifest next to the uploaded files"""
+        manifest = {
+            'version': version,
+            'created_at': datetime.now().isoformat(),
+            'file_count': len(entries),
+            'total_size': sum(entry['size'] for entry in entries),
+            'build': {
+                field: value for field, value in (build_info or {}).items()
+                if field in MANIFEST_BUILD_FIELDS
+            },
+            'files': {
+                entry['path']: {
+                    'size': entry['size'],
+                    'hash': entry['hash'],
+                    'content_type': entry['content_type'],
+                    'cache_control': entry['cache_control'],
+                    'content_encoding': entry['content_encoding']
+                }
+                for entry in sorted(entries, key=lambda e: e['path'])
+            }
+        }
+        
+        self.s3_client.put_object(
+            Bucket=self.bucket_name,
+            Key=f"{version_prefix}{MANIFEST_FILE}",
+            Body=json.dumps(manifest, separators=(',', ':')).encode('utf-8'),
+            ContentType='application/json',
+            CacheControl='no-cache'
+        )
     
     def _get_enhanced_content_type(self, file_path: Path) -> str:
         """Get proper content type for web files"""
@@ -192,75 +526,325 @@ class AWSManager:
         else:
             return 'public, max-age=86400'
     
-    def activate_version(self, project_name: str, version: str) -> Dict:
-        """Make version live by copying to current/"""
+    def activate_version(self, project_name: str, version: str,
+                         concurrency: Optional[int] = None,
+                         mode: str = DEFAULT_ACTIVATION_MODE) -> Dict:
+        """Make version live by syncing only changed files into current/"""
+        if mode not in ACTIVATION_MODES:
+            raise Exception(f"Unknown activation mode '{mode}' (expected one of: {', '.join(ACTIVATION_MODES)})")
+        
+        self.ensure_website_hosting()
+        
+        if mode == 'pointer':
+            return self._activate_pointer(project_name, version)
+        
         try:
             source_prefix = f"{project_name}/builds/{version}/"
             current_prefix = f"{project_name}/current/"
             
             print_step("ACTIVATE", "Making version live...")
             
-            # Delete current files
-            self._clear_prefix(current_prefix)
+            # List target version and live site in parallel
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                target_future = executor.submit(self._list_prefix_objects, source_prefix)
+                live_future = executor.submit(self._list_prefix_objects, current_prefix)
+                target_objects = target_future.result()
+                live_objects = live_future.result()
+            
+            if not target_objects:
+                raise Exception(f"Version '{version}' has no files")
+            
+            # Diff on ETag + size
+            changed = [key for key, meta in target_objects.items() if live_objects.get(key) != meta]
+            removed = [key for key in live_objects if key not in target_objects]
+            unchanged = len(target_objects) - len(changed)
             
-            # Copy new version to current
-            copied_files = self._copy_s3_prefix(source_prefix, current_prefix)
+            print_info(f"Changes: {len(changed)} to copy, {len(removed)} to remove, {unchanged} unchanged")
             
-            print_success(f"Website is now live ({copied_files} files)")
+            # Assets first, HTML entry points last so pages never reference missing files
+            assets = [key for key in changed if not key.lower().endswith('.html')]
+            pages = [key for key in changed if key.lower().endswith('.html')]
+            
+            for batch in (assets, pages):
+                if batch:
+                    self._copy_objects(
+                        [(f"{source_prefix}{key}", f"{current_prefix}{key}", target_objects[key][1]) for key in batch],
+                        concurrency
+                    )
+            
+            # Remove files that no longer exist once the new pages are live
+            self._delete_keys([f"{current_prefix}{key}" for key in removed])
+            
+            # Serve current/ directly again if the project was in pointer mode
+            self._set_routing_rule(project_name, None)
+            self._write_pointer(project_name, version, 'copy', self._version_summary(project_name, version, target_objects))
+            
+            print_success(f"Website is now live ({len(changed)} copied, {len(removed)} removed, {unchanged} unchanged)")
+            
+            return {
+                'version': version,
+                'copied_files': len(changed),
+                'deleted_files': len(removed),
+                'unchanged_files': unchanged,
+                'mode': 'copy',
+                'website_url': self._website_url(project_name)
+            }
+            
+        except Exception as e:
+            raise Exception(f"Failed to activate version: {str(e)}")
+    
+    def _activate_pointer(self, project_name: str, version: str) -> Dict:
+        """Make version live by redirecting current/ to it (O(1) API calls)"""
+        try:
+            version_prefix = f"{project_name}/builds/{version}/"
+            
+            print_step("ACTIVATE", "Pointing current/ at the new version...")
+            
+            response = self.s3_client.list_objects_v2(
+                Bucket=self.bucket_name,
+                Prefix=version_prefix,
+                MaxKeys=1
+            )
+            if not response.get('Contents'):
+                raise Exception(f"Version '{version}' has no files")
+            
+            self._set_routing_rule(project_name, version_prefix)
+            self._write_pointer(project_name, version, 'pointer', self._version_summary(project_name, version))
+            
+            print_success(f"Website is now live (current/ -> builds/{version}/)")
             
             return {
                 'version': version,
-                'copied_files': copied_files,
-                'website_url': f"http://{self.bucket_name}.s3-website.{self.region}.amazonaws.com/{project_name}/current/"
+                'copied_files': 0,
+                'deleted_files': 0,
+                'unchanged_files': 0,
+                'mode': 'pointer',
+                'website_url': self._website_url(project_name, version_prefix)
             }
             
         except Exception as e:
             raise Exception(f"Failed to activate version: {str(e)}")
     
+    def _set_routing_rule(self, project_name: str, target_prefix: Optional[str]) -> None:
+        """Redirect {project}/current/ to target_prefix, or remove the redirect if None
+        
+        The website configuration is shared by every project in the bucket, so
+        the read-modify-write runs under a bucket lock and is verified afterwards.
+        """
+        current_prefix = f"{project_name}/current/"
+        
+        with self._website_lock():
+            for attempt in range(WEBSITE_UPDATE_ATTEMPTS):
+                routing_rules = self._get_routing_rules()
+                
+                updated_rules = [
+                    rule for rule in routing_rules
+                    if rule.get('Condition', {}).get('KeyPrefixEquals') != current_prefix
+                ]
+                if target_prefix:
+                    updated_rules.append({
+                        'Condition': {'KeyPrefixEquals': current_prefix},
+                        'Redirect': {'ReplaceKeyPrefixWith': target_prefix, 'HttpRedirectCode': '302'}
+                    })
+                
+                if updated_rules == routing_rules:
+                    return
+                
+                if len(updated_rules) > MAX_ROUTING_RULES:
+                    raise Exception(f"Bucket website supports at most {MAX_ROUTING_RULES} pointer-mode projects")
+                
+                self.s3_client.put_bucket_website(
+                    Bucket=self.bucket_name,
+                    WebsiteConfiguration=self._website_configuration(updated_rules)
+                )
+                
+                # A writer that bypasses the lock (older deploy-tool) may have raced us
+                if self._get_routing_rules() == updated_rules:
+                    return
+                time.sleep(0.5 * (2 ** attempt))
+            
+            raise Exception(f"Routing rule for {project_name} was overwritten by a concurrent update")
+    
+    @contextmanager
+    def _website_lock(self) -> Iterator[None]:
+        """Hold the bucket-wide lock object guarding the website configuration"""
+        token = uuid.uuid4().hex
+        locked = self._acquire_website_lock(token)
+        try:
+            yield
+        finally:
+            if locked:
+                self._release_website_lock(token)
+    
+    def _acquire_website_lock(self, token: str) -> bool:
+        """Create the lock object with a conditional put (If-None-Match: *), waiting for other holders
+        
+        Returns False on S3 stand-ins without conditional writes, where only
+        the post-write verification protects the configuration.
+        """
+        deadline = time.time() + WEBSITE_LOCK_TIMEOUT
+        
+        while True:
+            try:
+                self.s3_client.put_object(
+                    Bucket=self.bucket_name,
+                    Key=WEBSITE_LOCK_KEY,
+                    Body=json.dumps({'token': token, 'acquired_at': time.time()}).encode('utf-8'),
+                    ContentType='application/json',
+                    IfNoneMatch='*'
+                )
+                return True
+            except ClientError as e:
+                code = e.response['Error']['Code']
+                if code == 'NotImplemented':
+                    print_warning("Endpoint does not support conditional writes, updating website config unlocked")
+                    return False
+                if code not in ('PreconditionFailed', 'ConditionalRequestConflict'):
+                    raise
+            
+            self._expire_website_lock()
+            if time.time() > deadline:
+                raise Exception("Timed out waiting for another deployment to update the website configuration")
+            time.sleep(0.5 + random.random())
+    
+    def _release_website_lock(self, token: str) -> None:
+        """Delete the lock object if this process still holds it"""
+        try:
+            lock = self._get_json_object(WEBSITE_LOCK_KEY)
+            if lock and lock.get('token') == token:
+                self.s3_client.delete_object(Bucket=self.bucket_name, Key=WEBSITE_LOCK_KEY)
+        except Exception as e:
+            print_warning(f"Could not release website lock, it expires in {WEBSITE_LOCK_STALE_SECONDS}s: {e}")
+    
+    def _expire_website_lock(self) -> None:
+        """Remove the website lock if its holder has been gone for too long"""
+        try:
+            lock = self._get_json_object(WEBSITE_LOCK_KEY)
+        except Exception:
+            return
+        if lock and time.time() - lock.get('acquired_at', 0) > WEBSITE_LOCK_STALE_SECONDS:
+            print_warning("Removing stale website configuration lock")
+            self.s3_client.delete_object(Bucket=self.bucket_name, Key=WEBSITE_LOCK_KEY)
+    
+    def _version_summary(self, project_name: str, version: str,
+                         objects: Optional[Dict[str, Tuple[str, int]]] = None) -> Optional[Dict]:
+        """File count, size and framework of a version, stored in the pointer for the discovery service"""
+        try:
+            manifest = self.load_manifest(project_name, version)
+            if manifest:
+                return {
+                    'file_count': manifest.get('file_count', 0),
+                    'total_size': manifest.get('total_size', 0),
+                    'framework': manifest.get('build', {}).get('framework') or 'unknown'
+                }
+            
+            # Older versions have no manifest
+            if objects is None:
+                objects = self._list_prefix_objects(f"{project_name}/builds/{version}/")
+            return {
+                'file_count': len(objects),
+                'total_size': sum(size for _, size in objects.values()),
+                'framework': 'unknown'
+            }
+        except Exception as e:
+            print_warning(f"Could not summarise version {version}: {e}")
+            return None
+    
+    def _write_pointer(self, project_name: str, version: str, mode: str,
+                       summary: Optional[Dict] = None) -> None:
+        """Record the active version in {project}/current.json"""
+        activated_at = datetime.now().isoformat()
+        pointer = {
+            'version': version,
+            'mode': mode,
+            'prefix': f"{project_name}/builds/{version}/" if mode == 'pointer' else f"{project_name}/current/",
+            'activated_at': activated_at
+        }
+        if summary:
+            pointer['summary'] = {**summary, 'last_modified': activated_at}
+        
+        self.s3_client.put_object(
+            Bucket=self.bucket_name,
+            Key=f"{project_name}/{POINTER_FILE}",
+            Body=json.dumps(pointer, separators=(',', ':')).encode('utf-8'),
+            ContentType='application/json',
+            CacheControl='no-cache'
+        )
+    
+    def _list_prefix_objects(self, prefix: str) -> Dict[str, Tuple[str, int]]:
+        """Map relative key to (ETag, size) for all objects under prefix"""
+        objects = {}
+        
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix):
+            for obj in page.get('Contents', []):
+                relative_key = obj['Key'][len(prefix):]
+                
+                # Version metadata stays with the build, it is not part of the site
+                if relative_key == MANIFEST_FILE:
+                    continue
+                
+                objects[relative_key] = (obj['ETag'], obj['Size'])
+        
+        return objects
+    
     def _clear_prefix(self, prefix: str) -> None:
         """Delete all objects with given prefix"""
         try:
             paginator = self.s3_client.get_paginator('list_objects_v2')
             pages = paginator.paginate(Bucket=self.bucket_name, Prefix=prefix)
             
-            objects_to_delete = []
+            keys_to_delete = []
             for page in pages:
                 for obj in page.get('Contents', []):
-                    objects_to_delete.append({'Key': obj['Key']})
-            
-            if objects_to_delete:
-                for i in range(0, len(objects_to_delete), 1000):
-                    batch = objects_to_delete[i:i+1000]
-                    self.s3_client.delete_objects(
-                        Bucket=self.bucket_name,
-                        Delete={'Objects': batch, 'Quiet': True}
-                    )
+                    keys_to_delete.append(obj['Key'])
+            
+            self._delete_keys(keys_to_delete)
         except Exception:
             pass
     
-    def _copy_s3_prefix(self, source_prefix: str, dest_prefix: str) -> int:
-        """Copy all objects from source prefix to destination prefix"""
-        copied_files = 0
+    def _delete_keys(self, keys: List[str]) -> None:
+        """Delete keys in batches of 1000"""
+        for i in range(0, len(keys), 1000):
+            batch = [{'Key': key} for key in keys[i:i+1000]]
+            self.s3_client.delete_objects(
+                Bucket=self.bucket_name,
+                Delete={'Objects': batch, 'Quiet': True}
+            )
+    
+    def _copy_objects(self, copies: Iterable[Tuple[str, str, int]],
+                      concurrency: Optional[int] = None) -> int:
+        """Server-side copy (source key, destination key, size) tuples on the transfer pool"""
+        transfer_manager = TransferManager(concurrency or DEFAULT_UPLOAD_CONCURRENCY)
+        progress = TransferProgress("Copied")
         
-        paginator = self.s3_client.get_paginator('list_objects_v2')
-        pages = paginator.paginate(Bucket=self.bucket_name, Prefix=source_prefix)
+        tasks = (
+            TransferTask(name=dest_key, size=size, action=self._make_copy_action(source_key, dest_key))
+            for source_key, dest_key, size in copies
+        )
         
-        for page in pages:
-            for obj in page.get('Contents', []):
-                source_key = obj['Key']
-                relative_key = source_key[len(source_prefix):]
-                dest_key = f"{dest_prefix}{relative_key}"
-                
-                # Copy with metadata preservation
-                self.s3_client.copy_object(
-                    CopySource={'Bucket': self.bucket_name, 'Key': source_key},
-                    Bucket=self.bucket_name,
-                    Key=dest_key,
-                    MetadataDirective='COPY'
-                )
-                copied_files += 1
+        transfer_manager.run(tasks, progress)
+        summary = progress.summary()
+        
+        print_info(
+            f"Copied {summary['files']} files ({format_file_size(summary['bytes'])}) "
+            f"in {summary['elapsed_seconds']}s ({format_file_size(summary['bytes_per_second'])}/s)"
+        )
+        
+        return summary['files']
+    
+    def _make_copy_action(self, source_key: str, dest_key: str):
+        """Create server-side copy callable for a single key"""
+        def copy():
+            # Copy with metadata preservation
+            self.s3_client.copy_object(
+                CopySource={'Bucket': self.bucket_name, 'Key': source_key},
+                Bucket=self.bucket_name,
+                Key=dest_key,
+                MetadataDirective='COPY'
+            )
         
-        return copied_files
+        return copy
     
     def list_versions(self, project_name: str) -> List[str]:
         """List available versions"""
@@ -292,18 +876,26 @@ class AWSManager:
         try:
             current_prefix = f"{project_name}/current/"
             
-            response = self.s3_client.list_objects_v2(
-                Bucket=self.bucket_name,
-                Prefix=current_prefix,
-                MaxKeys=1
-            )
+            pointer = self.load_pointer(project_name)
+            if pointer:
+                is_deployed = True
+            else:
+                # Deployed before current.json existed
+                response = self.s3_client.list_objects_v2(
+                    Bucket=self.bucket_name,
+                    Prefix=current_prefix,
+                    MaxKeys=1
+                )
+                is_deployed = 'Contents' in response and len(response['Contents']) > 0
             
-            is_deployed = 'Contents' in response and len(response['Contents']) > 0
-            website_url = f"http://{self.bucket_name}.s3-website.{self.region}.amazonaws.com/{project_name}/current/"
+            pointer_prefix = pointer.get('prefix') if pointer and pointer.get('mode') == 'pointer' else None
+            website_url = self._website_url(project_name, pointer_prefix)
             
             return {
                 'is_deployed': is_deployed,
                 'website_url': website_url if is_deployed else None,
+                'active_version': pointer.get('version') if pointer else None,
+                'activation_mode': pointer.get('mode') if pointer else None,
                 'bucket': self.bucket_name,
                 'region': self.region
             }
@@ -320,6 +912,13 @@ class AWSManager:
                 return 0
             
             versions_to_delete = versions[keep_count:]
+            
+            # A pointer-mode site is served straight from its version prefix
+            pointer = self.load_pointer(project_name)
+            if pointer and pointer.get('mode') == 'pointer' and pointer.get('version') in versions_to_delete:
+                print_info(f"Keeping {pointer['version']}, it is the live version")
+                versions_to_delete.remove(pointer['version'])
+            
             deleted_count = 0
             
             for version in versions_to_delete:
@@ -1,29 +1,50 @@
 import os
 import json
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Dict, Optional, Sequence, Tuple
 import subprocess
 import shutil
 import tempfile
-import time
-import threading
-import re
+import hashlib
 
 from .utils import (
     print_info, print_error, print_warning, print_step, print_success,
     run_command, check_command_exists, load_json_file,
-    format_file_size, get_directory_size, clean_directory
+    format_file_size, get_directory_size, clean_directory,
+    FileEntry, scan_tree, refresh_entry
 )
+from .cache_manager import CacheManager
+from .image_manager import ImageManager
+from .rewrite_manager import RewriteManager, rewrite_html_file, REWRITE_SUFFIXES
+from ..config.constants import (
+    WORKSPACE_DIR_NAME, DEPENDENCY_CACHE_MAX_BYTES, DEPENDENCY_LOCK_FILES,
+    DEPENDENCY_CACHE_EXCLUDES, BUILD_CACHE_MAX_BYTES, BUILD_ENV_PREFIXES
+)
+from .. import __version__
 
 class BuildManager:
     """Robust build manager with automatic dependency resolution and path fixes"""
     
     def __init__(self):
-        self.work_dir = Path(tempfile.gettempdir()) / "deploy-workspace"
+        self.work_dir = Path(tempfile.gettempdir()) / WORKSPACE_DIR_NAME
         self.work_dir.mkdir(exist_ok=True)
+        self.dependency_cache = CacheManager("dependencies", DEPENDENCY_CACHE_MAX_BYTES, self.work_dir)
+        self.build_cache = CacheManager("builds", BUILD_CACHE_MAX_BYTES, self.work_dir)
+        # File inventory of the last build output, shared with the upload step
+        self.inventory: Optional[Tuple[FileEntry, ...]] = None
+        self.rewrite_manager = RewriteManager()
+        self.rewrite_report: Optional[Dict] = None
     
-    def build_and_prepare_for_deployment(self, repo_dir: Path) -> Tuple[Path, Dict]:
-        """Complete build pipeline with automatic fixes"""
+    def build_and_prepare_for_deployment(self, repo_dir: Path,
+                                         build_config: Optional[Dict] = None,
+                                         defer_html_fixes: bool = False) -> Tuple[Path, Dict]:
+        """Complete build pipeline with automatic fixes
+
+        With defer_html_fixes the HTML path fixes are left to the upload
+        pipeline (see fix_deferred_file) and the output is cached afterwards.
+        """
+        self.inventory = None
+        self.rewrite_report = None
         try:
             # Find package.json and project directory
             project_dir, relative_path = self._find_package_json(repo_dir)
@@ -36,36 +57,150 @@ class BuildManager:
             print_info(f"Framework: {framework}")
             print_info(f"Build directory: {build_dir_name}")
             
+            # Skip the build entirely if this commit was already built with the same inputs
+            commit = self._get_commit_sha(repo_dir)
+            cache_key = self._build_cache_key(commit, relative_path, framework, build_dir_name, build_config)
+            cached = self._restore_cached_build(cache_key, project_dir / build_dir_name, repo_dir)
+            if cached:
+                return cached
+            
             # Build the project with automatic fixes
             print_step("BUILD", "Building project...")
             build_dir = self._build_project_robust(project_dir, framework, build_dir_name)
             
             # Verify and fix build
-            if not self._verify_and_fix_build(build_dir):
+            if not self._verify_and_fix_build(build_dir, defer_html=defer_html_fixes):
                 raise Exception("Build failed - no valid content generated")
             
-            file_count = len(list(build_dir.rglob('*')))
-            build_size = get_directory_size(build_dir)
+            # Optional lossless image optimization (build.optimize_images)
+            image_report = None
+            if (build_config or {}).get('optimize_images'):
+                image_report = self._optimize_images()
             
-            print_success(f"Build completed: {file_count} files, {format_file_size(build_size)}")
+            file_count = len(self.inventory)
+            build_size = get_directory_size(build_dir, self.inventory)
             
-            # Schedule cleanup
-            self._schedule_cleanup(repo_dir)
+            print_success(f"Build completed: {file_count} files, {format_file_size(build_size)}")
             
             build_info = {
                 'framework': framework,
                 'project_path': relative_path,
                 'build_dir': str(build_dir),
                 'total_files': file_count,
-                'total_size_formatted': format_file_size(build_size)
+                'total_size_formatted': format_file_size(build_size),
+                'commit': commit,
+                'build_cache_key': cache_key,
+                'build_cache_hit': False,
+                'html_fixes_deferred': defer_html_fixes,
+                'path_rewrite': self._summarize_rewrite(self.rewrite_report),
+                'image_optimization': image_report
             }
             
+            # Deferred builds are cached once the pipeline has fixed them
+            if not defer_html_fixes:
+                self.cache_build_output(build_dir, build_info)
+            
             return build_dir, build_info
             
         except Exception as e:
             self._cleanup_directory(repo_dir)
             raise Exception(f"Build failed: {str(e)}")
     
+    def cache_build_output(self, build_dir: Path, build_info: Dict) -> None:
+        """Store a finished (path-fixed) build output in the build cache"""
+        cache_key = build_info.get('build_cache_key')
+        if not cache_key:
+            return
+        
+        try:
+            metadata = dict(build_info, html_fixes_deferred=False)
+            self.build_cache.put(cache_key, build_dir, metadata=metadata)
+            print_info(f"Cached build output ({cache_key[:12]})")
+        except Exception as e:
+            print_warning(f"Could not cache build output: {e}")
+    
+    def fix_deferred_file(self, file_path: Path) -> None:
+        """Pipeline stage: apply the path fixes skipped by defer_html_fixes"""
+        if file_path.suffix.lower() == '.html':
+            self._fix_single_html_file(file_path)
+    
+    def _get_commit_sha(self, repo_dir: Path) -> Optional[str]:
+        """Get HEAD commit of the cloned repository"""
+        try:
+            result = subprocess.run(
+                ['git', 'rev-parse', 'HEAD'],
+                cwd=str(repo_dir),
+                capture_output=True,
+                text=True,
+                timeout=10,
+                check=True
+            )
+            return result.stdout.strip() or None
+        except Exception:
+            return None
+    
+    def _build_cache_key(self, commit: Optional[str], project_path: str, framework: str,
+                         build_dir_name: str, build_config: Optional[Dict]) -> Optional[str]:
+        """Hash everything that determines the build output (None without a commit)"""
+        if not commit:
+            return None
+        
+        inputs = {
+            'commit': commit,
+            'project_path': project_path,
+            'framework': framework,
+            'build_dir': build_dir_name,
+            'build_config': build_config or {},
+            'env': self._build_env(),
+            'node': self._get_node_version(),
+            'tool_version': __version__
+        }
+        return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode('utf-8')).hexdigest()
+    
+    def _build_env(self) -> Dict[str, str]:
+        """Environment variables that are baked into the build output"""
+        return {
+            key: value for key, value in os.environ.items()
+            if any(key.startswith(prefix) for prefix in BUILD_ENV_PREFIXES)
+        }
+    
+    def deploy_inputs_hash(self, build_config: Optional[Dict] = None,
+                           compression: Optional[Dict] = None) -> str:
+        """Hash of everything besides the commit that changes what gets deployed"""
+        inputs = {
+            'build_config': build_config or {},
+            'env': self._build_env(),
+            'compression': compression or {},
+            'tool_version': __version__
+        }
+        return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode('utf-8')).hexdigest()
+    
+    def _restore_cached_build(self, cache_key: Optional[str], build_dir: Path,
+                              repo_dir: Path) -> Optional[Tuple[Path, Dict]]:
+        """Restore a previous build output for the same inputs"""
+        if not cache_key:
+            return None
+        
+        try:
+            meta = self.build_cache.get_meta(cache_key)
+            if not meta or not self.build_cache.restore(cache_key, build_dir):
+                return None
+        except Exception as e:
+            print_warning(f"Could not restore cached build: {e}")
+            return None
+        
+        self.inventory = scan_tree(build_dir)
+        build_info = dict(meta.get('metadata', {}))
+        build_info['build_dir'] = str(build_dir)
+        build_info['build_cache_hit'] = True
+        
+        print_success(
+            f"Reusing cached build ({cache_key[:12]}): {build_info.get('total_files')} files, "
+            f"{build_info.get('total_size_formatted')}"
+        )
+        
+        return build_dir, build_info
+    
     def detect_project_directory(self, project_dir: Path) -> Tuple[str, Path]:
         """Detect project for init command"""
         try:
@@ -293,14 +428,58 @@ export default defineConfig({
             print_warning(f"React preparation failed: {e}")
     
     def _install_dependencies_robust(self, project_dir: Path):
+        """Install dependencies, restoring node_modules from the local cache when possible"""
+        cache_key = self._dependency_cache_key(project_dir)
+        node_modules = project_dir / 'node_modules'
+        
+        if cache_key:
+            try:
+                if self.dependency_cache.restore(cache_key, node_modules):
+                    print_success(f"Dependencies restored from cache ({cache_key[:12]})")
+                    return
+            except Exception as e:
+                print_warning(f"Could not restore cached dependencies: {e}")
+        
+        self._run_dependency_install(project_dir)
+        
+        if cache_key and node_modules.exists():
+            try:
+                self.dependency_cache.put(cache_key, node_modules, exclude=DEPENDENCY_CACHE_EXCLUDES)
+                print_info(f"Cached dependencies ({cache_key[:12]})")
+            except Exception as e:
+                print_warning(f"Could not cache dependencies: {e}")
+    
+    def _dependency_cache_key(self, project_dir: Path) -> Optional[str]:
+        """Hash lockfile contents and Node version (None if there is no lockfile)"""
+        lock_files = [project_dir / name for name in DEPENDENCY_LOCK_FILES if (project_dir / name).exists()]
+        if not lock_files:
+            return None
+        
+        digest = hashlib.sha256()
+        for lock_file in lock_files:
+            digest.update(lock_file.name.encode('utf-8'))
+            digest.update(lock_file.read_bytes())
+        digest.update(self._get_node_version().encode('utf-8'))
+        digest.update(os.name.encode('utf-8'))
+        return digest.hexdigest()
+    
+    def _get_node_version(self) -> str:
+        """Get installed Node.js version"""
+        try:
+            result = subprocess.run(
+                ['node', '--version'],
+                capture_output=True,
+                text=True,
+                timeout=10,
+                shell=True if os.name == 'nt' else False
+            )
+            return result.stdout.strip()
+        except Exception:
+            return 'unknown'
+    
+    def _run_dependency_install(self, project_dir: Path):
         """Robust dependency installation with multiple strategies"""
         try:
-            # Clear npm cache first
-            try:
-                run_command(['npm', 'cache', 'clean', '--force'], cwd=str(project_dir), timeout=60)
-            except:
-                pass
-            
             # Strategy 1: npm ci
             try:
                 print_info("Installing dependencies with npm ci...")
@@ -417,79 +596,73 @@ export default defineConfig({
         if not build_successful:
             raise Exception("All build strategies failed")
     
-    def _verify_and_fix_build(self, build_dir: Path) -> bool:
+    def _verify_and_fix_build(self, build_dir: Path, defer_html: bool = False) -> bool:
         """Verify build has content and fix asset paths"""
         if not build_dir.exists():
             return False
         
-        # Check for any files
-        files = list(build_dir.rglob('*'))
-        files = [f for f in files if f.is_file()]
+        # Single walk of the output; reused for counts, sizes and upload
+        inventory = scan_tree(build_dir)
         
-        if len(files) == 0:
+        if len(inventory) == 0:
             return False
         
-        # Fix asset paths in HTML files
-        self._fix_all_asset_paths(build_dir)
+        # Fix asset paths in HTML, CSS and JS files (HTML may be left to the upload pipeline)
+        suffixes = [suffix for suffix in REWRITE_SUFFIXES if not (defer_html and suffix == '.html')]
+        inventory = self._fix_all_asset_paths(inventory, suffixes)
+        
+        self.inventory = inventory
         
         # Verify we have essential web files
-        web_files = [f for f in files if f.suffix.lower() in ['.html', '.js', '.css']]
+        web_files = [entry for entry in inventory if entry.suffix in ['.html', '.js', '.css']]
         return len(web_files) > 0
     
-    def _fix_all_asset_paths(self, build_dir: Path):
-        """Fix asset paths in all HTML files for S3 compatibility"""
+    def _fix_all_asset_paths(self, inventory: Tuple[FileEntry, ...],
+                             suffixes: Sequence[str] = REWRITE_SUFFIXES) -> Tuple[FileEntry, ...]:
+        """Fix asset paths in build files for S3 compatibility, returns the updated inventory"""
         try:
-            # Find all HTML files
-            html_files = list(build_dir.rglob('*.html'))
-            
-            for html_file in html_files:
-                self._fix_single_html_file(html_file)
+            self.rewrite_report = self.rewrite_manager.rewrite_files(inventory, suffixes)
+            changed = set(self.rewrite_report['changed'])
             
-            if html_files:
-                print_success(f"Fixed asset paths in {len(html_files)} HTML files")
+            return tuple(refresh_entry(entry) if entry.key in changed else entry for entry in inventory)
             
         except Exception as e:
             print_warning(f"Could not fix asset paths: {e}")
+            return inventory
     
-    def _fix_single_html_file(self, html_file: Path):
-        """Fix asset paths in a single HTML file"""
+    def _optimize_images(self) -> Optional[Dict]:
+        """Optimize images in the build output and refresh their inventory entries"""
         try:
-            content = html_file.read_text(encoding='utf-8')
-            original_content = content
-            
-            # Fix script src paths (absolute to relative)
-            content = re.sub(r'<script([^>]*)\ssrc="(/[^"]*)"', r'<script\1 src=".\2"', content)
-            
-            # Fix link href paths (CSS and other resources)
-            content = re.sub(r'<link([^>]*)\shref="(/[^"]*)"', r'<link\1 href=".\2"', content)
-            
-            # Fix img src paths
-            content = re.sub(r'<img([^>]*)\ssrc="(/[^"]*)"', r'<img\1 src=".\2"', content)
-            
-            # Fix any other absolute paths in common attributes
-            content = re.sub(r'(src|href|action)="(/[^"]*)"', r'\1=".\2"', content)
-            
-            # Remove problematic base tags that can break S3 hosting
-            content = re.sub(r'<base[^>]*/?>', '', content)
-            
-            # Fix any absolute paths in CSS imports or JS
-            content = re.sub(r'url\(/([^)]*)\)', r'url(./\1)', content)
-            
-            # Write back if changed
-            if content != original_content:
-                html_file.write_text(content, encoding='utf-8')
-                print_info(f"Fixed paths in {html_file.name}")
-            
+            print_step("OPTIMIZE", "Optimizing images...")
+            report = ImageManager(self.work_dir).optimize(self.inventory)
+            changed = set(report.pop('changed'))
+            self.inventory = tuple(refresh_entry(entry) if entry.key in changed else entry for entry in self.inventory)
+            return report
         except Exception as e:
-            print_warning(f"Could not fix {html_file.name}: {e}")
+            print_warning(f"Could not optimize images: {e}")
+            return None
     
-    def _schedule_cleanup(self, directory: Path):
-        """Schedule cleanup after deployment"""
-        def cleanup_after_delay():
-            time.sleep(30)  # Wait for deployment to complete
-            self._cleanup_directory(directory)
+    def _summarize_rewrite(self, report: Optional[Dict]) -> Optional[Dict]:
+        """Rewrite report fields worth keeping in build info"""
+        if not report:
+            return None
+        fields = ('files', 'changed_files', 'bytes_delta', 'seconds', 'rewritten_assets', 'slowest')
+        return {field: report[field] for field in fields}
+    
+    def _fix_single_html_file(self, html_file: Path) -> bool:
+        """Fix asset paths in a single HTML file, returns True if it was rewritten"""
+        result = rewrite_html_file(str(html_file))
+        
+        if result['error']:
+            print_warning(f"Could not fix {html_file.name}: {result['error']}")
+        elif result['changed']:
+            print_info(f"Fixed paths in {html_file.name}")
         
-        threading.Thread(target=cleanup_after_delay, daemon=True).start()
+        return result['changed']
+    
+    def cleanup_repository(self, repo_dir: Path):
+        """Remove the cloned repository once its build output is uploaded and cached"""
+        self._cleanup_directory(repo_dir)
     
     def _cleanup_directory(self, directory: Path):
         """Clean up directory"""
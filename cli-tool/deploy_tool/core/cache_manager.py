@@ -0,0 +1,188 @@
+import json
+import os
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .utils import (
+    print_info, print_warning, format_file_size, get_directory_size,
+    clean_directory, link_tree
+)
+from ..config.constants import WORKSPACE_DIR_NAME
+
+
+class CacheManager:
+    """Size-bounded LRU cache of directories under the deploy workspace"""
+
+    def __init__(self, name: str, max_bytes: int, root: Optional[Path] = None):
+        self.name = name
+        self.max_bytes = max_bytes
+        root = root or Path(tempfile.gettempdir()) / WORKSPACE_DIR_NAME
+        self.cache_dir = root / "cache" / name
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def entry_path(self, key: str) -> Path:
+        """Directory holding a cache entry"""
+        return self.cache_dir / key
+
+    def _meta_path(self, key: str) -> Path:
+        """Metadata file for a cache entry"""
+        return self.cache_dir / f"{key}.json"
+
+    def _load_meta(self, key: str) -> Optional[Dict]:
+        """Load entry metadata (None if missing or corrupt)"""
+        try:
+            with open(self._meta_path(key), 'r') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def _save_meta(self, key: str, meta: Dict) -> None:
+        """Save entry metadata atomically so concurrent readers never see a partial file"""
+        temp_path = self.cache_dir / f".{key}.{uuid.uuid4().hex[:8]}.json.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(meta, f, indent=2, sort_keys=True)
+        os.replace(temp_path, self._meta_path(key))
+
+    def get(self, key: str) -> Optional[Path]:
+        """Return entry directory on a hit and mark it as recently used"""
+        meta = self._load_meta(key)
+        path = self.entry_path(key)
+
+        if meta is None or not path.exists():
+            return None
+
+        meta['last_used'] = time.time()
+        meta['hits'] = meta.get('hits', 0) + 1
+        self._save_meta(key, meta)
+        return path
+
+    def get_meta(self, key: str) -> Optional[Dict]:
+        """Return entry metadata without touching it"""
+        return self._load_meta(key)
+
+    def restore(self, key: str, destination: Path) -> bool:
+        """Hardlink a cached entry into destination, returns False on a miss"""
+        path = self.get(key)
+        if path is None:
+            return False
+
+        if destination.exists():
+            clean_directory(destination)
+        link_tree(path, destination)
+        return True
+
+    def put(self, key: str, source: Path, exclude: Optional[List[str]] = None,
+            metadata: Optional[Dict] = None, evict: bool = True) -> Path:
+        """Snapshot source into the cache, then evict down to the size limit
+
+        Batch writers pass evict=False and call evict() once at the end.
+        """
+        staging = self.cache_dir / f".tmp-{key}-{uuid.uuid4().hex[:8]}"
+
+        try:
+            link_tree(source, staging, exclude)
+            final_path = self.entry_path(key)
+
+            if final_path.exists():
+                # Another deploy stored the same key first
+                clean_directory(staging)
+            else:
+                staging.rename(final_path)
+        except Exception:
+            clean_directory(staging)
+            raise
+
+        now = time.time()
+        self._save_meta(key, {
+            'key': key,
+            'size': get_directory_size(final_path),
+            'created': now,
+            'last_used': now,
+            'hits': 0,
+            'metadata': metadata or {}
+        })
+
+        if evict:
+            self.evict()
+        return final_path
+
+    def commit(self, key: str, metadata: Optional[Dict] = None) -> None:
+        """Register an entry that was written in place at entry_path(key)"""
+        meta = self._load_meta(key) or {'key': key, 'created': time.time(), 'hits': 0}
+        meta['size'] = get_directory_size(self.entry_path(key))
+        meta['last_used'] = time.time()
+        if metadata:
+            meta['metadata'] = metadata
+        self._save_meta(key, meta)
+        self.evict(keep=key)
+
+    def entries(self) -> List[Dict]:
+        """All entries, most recently used first"""
+        entries = []
+        for meta_file in self.cache_dir.glob('*.json'):
+            meta = self._load_meta(meta_file.stem)
+            if meta and self.entry_path(meta_file.stem).exists():
+                entries.append(meta)
+        return sorted(entries, key=lambda m: m.get('last_used', 0), reverse=True)
+
+    def total_size(self) -> int:
+        """Total recorded size of all entries"""
+        return sum(entry.get('size', 0) for entry in self.entries())
+
+    def remove(self, key: str) -> None:
+        """Delete a single entry"""
+        clean_directory(self.entry_path(key))
+        meta_path = self._meta_path(key)
+        if meta_path.exists():
+            meta_path.unlink()
+
+    def evict(self, max_bytes: Optional[int] = None, keep: Optional[str] = None) -> Tuple[int, int]:
+        """Remove least recently used entries until the cache fits, returns (entries, bytes) freed"""
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        entries = [entry for entry in self.entries() if entry['key'] != keep]
+        if keep:
+            limit -= (self._load_meta(keep) or {}).get('size', 0)
+        total = sum(entry.get('size', 0) for entry in entries)
+        removed = 0
+        freed = 0
+
+        while entries and total > limit:
+            entry = entries.pop()
+            try:
+                self.remove(entry['key'])
+            except Exception as e:
+                print_warning(f"Could not evict cache entry {entry['key']}: {e}")
+                continue
+            total -= entry.get('size', 0)
+            freed += entry.get('size', 0)
+            removed += 1
+
+        if removed:
+            print_info(f"Evicted {removed} {self.name} cache entries ({format_file_size(freed)})")
+
+        return removed, freed
+
+    def expire(self, max_age_seconds: float) -> int:
+        """Remove entries not used within max_age_seconds"""
+        cutoff = time.time() - max_age_seconds
+        expired = 0
+
+        for entry in self.entries():
+            if entry.get('last_used', 0) < cutoff:
+                try:
+                    self.remove(entry['key'])
+                    expired += 1
+                except Exception as e:
+                    print_warning(f"Could not remove stale cache entry {entry['key']}: {e}")
+
+        if expired:
+            print_info(f"Removed {expired} stale {self.name} cache entries")
+
+        return expired
+
+    def clear(self) -> Tuple[int, int]:
+        """Remove every entry"""
+        return self.evict(0)
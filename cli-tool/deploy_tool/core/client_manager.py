@@ -0,0 +1,127 @@
+import hashlib
+import json
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from ..config.constants import WORKSPACE_DIR_NAME, CLIENT_POOL_SIZES, STS_IDENTITY_TTL
+
+# Process-wide caches; boto3 itself is imported lazily to keep CLI startup fast
+_lock = threading.Lock()
+_sessions: Dict[Optional[str], Any] = {}
+_clients: Dict[Tuple, Any] = {}
+_identities: Dict[Tuple, Tuple[float, Dict]] = {}
+
+# Errors meaning the credentials (usually an SSO session) have expired
+EXPIRED_CREDENTIAL_CODES = {'ExpiredToken', 'ExpiredTokenException', 'RequestExpired', 'UnauthorizedSSOToken'}
+EXPIRED_CREDENTIAL_ERRORS = {'UnauthorizedSSOTokenError', 'SSOTokenLoadError', 'TokenRetrievalError'}
+
+
+def get_session(profile: Optional[str] = None):
+    """Shared boto3 session for a profile (credentials are resolved once per process)"""
+    with _lock:
+        session = _sessions.get(profile)
+        if session is None:
+            import boto3
+            session = boto3.Session(profile_name=profile)
+            _sessions[profile] = session
+        return session
+
+
+def get_client(service: str, profile: Optional[str] = None, region: Optional[str] = None,
+               endpoint_url: Optional[str] = None):
+    """Shared, thread-safe client per (profile, region, service, endpoint)"""
+    key = (profile, region, service, endpoint_url)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    session = get_session(profile)
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            from botocore.config import Config
+            # Sessions are not thread-safe, so clients are only created under the lock
+            client = session.client(
+                service,
+                region_name=region,
+                endpoint_url=endpoint_url,
+                config=Config(max_pool_connections=CLIENT_POOL_SIZES.get(service, 10))
+            )
+            _clients[key] = client
+        return client
+
+
+def get_caller_identity(profile: Optional[str] = None, region: Optional[str] = None,
+                        refresh: bool = False) -> Dict:
+    """STS caller identity, cached in memory and on disk for STS_IDENTITY_TTL seconds"""
+    key = (profile, region)
+    now = time.time()
+
+    if not refresh:
+        cached = _identities.get(key) or _load_identity(key)
+        if cached and now - cached[0] < STS_IDENTITY_TTL:
+            # Resolving credentials is local while they are valid and raises once the SSO session expired
+            get_session(profile).get_credentials().get_frozen_credentials()
+            _identities[key] = cached
+            return cached[1]
+
+    response = get_client('sts', profile, region).get_caller_identity()
+    identity = {field: response.get(field) for field in ('Account', 'Arn', 'UserId')}
+    _identities[key] = (now, identity)
+    _save_identity(key, now, identity)
+    return identity
+
+
+def clear_cache() -> None:
+    """Forget all sessions, clients and identities, including the on-disk identities"""
+    with _lock:
+        _sessions.clear()
+        _clients.clear()
+        _identities.clear()
+    for path in _identity_path(()).parent.glob('identity-*.json'):
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+def is_expired_credentials_error(error: BaseException) -> bool:
+    """True if error, or an error it was raised from, means the credentials expired"""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if type(error).__name__ in EXPIRED_CREDENTIAL_ERRORS:
+            return True
+        code = getattr(error, 'response', {}).get('Error', {}).get('Code')
+        if code in EXPIRED_CREDENTIAL_CODES:
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+def _identity_path(key: Tuple) -> Path:
+    """On-disk identity cache shared by consecutive CLI invocations"""
+    digest = hashlib.sha256(json.dumps(key).encode('utf-8')).hexdigest()[:16]
+    return Path(tempfile.gettempdir()) / WORKSPACE_DIR_NAME / "state" / f"identity-{digest}.json"
+
+
+def _load_identity(key: Tuple) -> Optional[Tuple[float, Dict]]:
+    """Read a cached identity (None if missing or unreadable)"""
+    try:
+        data = json.loads(_identity_path(key).read_text())
+        return data['verified_at'], data['identity']
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _save_identity(key: Tuple, verified_at: float, identity: Dict) -> None:
+    """Persist a verified identity; failures only cost a later STS call"""
+    try:
+        path = _identity_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({'verified_at': verified_at, 'identity': identity}))
+    except OSError:
+        pass
@@ -0,0 +1,128 @@
+import gzip
+import os
+import tempfile
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+try:
+    import brotli
+except ImportError:  # optional: pip install deploy-tool[brotli]
+    brotli = None
+
+from .utils import print_info, print_warning, format_file_size, clean_directory, FileEntry
+from ..config.constants import (
+    WORKSPACE_DIR_NAME, COMPRESSIBLE_SUFFIXES, DEFAULT_COMPRESSION, COMPRESSION_PARALLEL_THRESHOLD
+)
+
+
+class CompressedVariant(NamedTuple):
+    """Pre-compressed copy of a build file staged for upload"""
+    key: str            # upload key: the original key for gzip, '<key>.br' for brotli sidecars
+    path: Path          # staged file holding the compressed bytes
+    encoding: str       # Content-Encoding value
+    size: int
+    original_size: int
+
+
+def compress_file(job: Tuple[str, str, str, Dict]) -> List[Tuple]:
+    """Write worthwhile gzip/brotli variants of one file (process pool worker)"""
+    source, key, staging_dir, settings = job
+    raw = Path(source).read_bytes()
+    limit = len(raw) * settings['max_ratio']
+    variants = []
+
+    candidates = [('gzip', '.gz', lambda: gzip.compress(raw, compresslevel=settings['gzip_level'], mtime=0))]
+    if settings['brotli'] and brotli is not None:
+        candidates.append(('br', '.br', lambda: brotli.compress(raw, quality=settings['brotli_quality'])))
+
+    for encoding, extension, compress in candidates:
+        data = compress()
+        if len(data) > limit:
+            continue
+        target = Path(staging_dir) / f"{key}{extension}"
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(data)
+        upload_key = key if encoding == 'gzip' else f"{key}{extension}"
+        variants.append((upload_key, str(target), encoding, len(data), len(raw)))
+
+    return variants
+
+
+class CompressionManager:
+    """Produces pre-compressed upload variants of compressible build files"""
+
+    def __init__(self, settings: Optional[Dict] = None, max_workers: Optional[int] = None):
+        self.settings = dict(DEFAULT_COMPRESSION, **(settings or {}))
+        self.max_workers = max_workers or os.cpu_count() or 1
+        # Staged outside the build and cache trees so neither is modified
+        self.staging_dir = (
+            Path(tempfile.gettempdir()) / WORKSPACE_DIR_NAME / "compression" / uuid.uuid4().hex[:12]
+        )
+
+        if self.settings['brotli'] and brotli is None:
+            print_warning("Brotli compression requested but the 'brotli' package is not installed")
+
+    @property
+    def enabled(self) -> bool:
+        """Whether compression is turned on"""
+        return bool(self.settings.get('enabled'))
+
+    def is_compressible(self, suffix: str, size: int) -> bool:
+        """Whether a file type and size are worth compressing"""
+        return suffix.lower() in COMPRESSIBLE_SUFFIXES and size >= self.settings['min_size']
+
+    def compress(self, entries: Sequence[FileEntry]) -> Dict[str, List[CompressedVariant]]:
+        """Compress eligible files, returns variants by source key"""
+        jobs = [
+            (str(entry.path), entry.key, str(self.staging_dir), self.settings)
+            for entry in entries if self.is_compressible(entry.suffix, entry.size)
+        ]
+        if not jobs:
+            return {}
+
+        results = self._run(jobs)
+        variants = {}
+        for job, result in zip(jobs, results):
+            if result:
+                variants[job[1]] = [CompressedVariant(upload_key, Path(staged), *rest) for upload_key, staged, *rest in result]
+
+        self._report(variants, len(jobs))
+        return variants
+
+    def compress_one(self, path: Path, key: str) -> List[CompressedVariant]:
+        """Compress a single file in the calling thread (pipeline stage)"""
+        size = path.stat().st_size
+        if not self.is_compressible(path.suffix, size):
+            return []
+        result = compress_file((str(path), key, str(self.staging_dir), self.settings))
+        return [CompressedVariant(upload_key, Path(staged), *rest) for upload_key, staged, *rest in result]
+
+    def _run(self, jobs: List[Tuple]) -> List[List[Tuple]]:
+        """Map compress_file over jobs, using a process pool when it pays off"""
+        if len(jobs) < COMPRESSION_PARALLEL_THRESHOLD or self.max_workers < 2:
+            return [compress_file(job) for job in jobs]
+
+        try:
+            chunksize = max(1, len(jobs) // (self.max_workers * 4))
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                return list(executor.map(compress_file, jobs, chunksize=chunksize))
+        except (OSError, RuntimeError) as e:
+            # Sandboxed environments may not allow worker processes
+            print_warning(f"Parallel compression unavailable ({e}), compressing serially")
+            return [compress_file(job) for job in jobs]
+
+    def _report(self, variants: Dict[str, List[CompressedVariant]], eligible: int) -> None:
+        """Print how much the gzip variants save"""
+        gzipped = [v for file_variants in variants.values() for v in file_variants if v.encoding == 'gzip']
+        original = sum(v.original_size for v in gzipped)
+        compressed = sum(v.size for v in gzipped)
+        print_info(
+            f"Compressed {len(gzipped)}/{eligible} eligible files: "
+            f"{format_file_size(original)} -> {format_file_size(compressed)}"
+        )
+
+    def cleanup(self) -> None:
+        """Remove staged variants"""
+        clean_directory(self.staging_dir)
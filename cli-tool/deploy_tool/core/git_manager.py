@@ -7,19 +7,23 @@ import tempfile
 import uuid
 import threading
 import time
+import hashlib
 
 from .utils import (
     print_info, print_error, print_warning, print_step, print_success,
     run_command, clean_directory, create_temp_directory,
     validate_github_url, extract_repo_name
 )
+from .cache_manager import CacheManager
+from ..config.constants import WORKSPACE_DIR_NAME, MIRROR_CACHE_MAX_BYTES, MIRROR_MAX_AGE_DAYS
 
 class GitManager:
     """Simple Git manager - clone repository and cleanup"""
     
     def __init__(self):
-        self.work_dir = Path(tempfile.gettempdir()) / "deploy-workspace"
+        self.work_dir = Path(tempfile.gettempdir()) / WORKSPACE_DIR_NAME
         self.work_dir.mkdir(exist_ok=True)
+        self.mirror_cache = CacheManager("mirrors", MIRROR_CACHE_MAX_BYTES, self.work_dir)
     
     def validate_github_url(self, url: str) -> bool:
         """Validate GitHub URL"""
@@ -37,14 +41,7 @@ class GitManager:
         try:
             print_info("Cloning repository...")
             
-            run_command([
-                'git', 'clone', 
-                '--depth', '1',
-                '--single-branch',
-                '--no-tags',
-                github_url, 
-                str(target_dir)
-            ], timeout=300)
+            self._clone(github_url, target_dir)
             
             print_success("Repository cloned")
             return target_dir
@@ -61,14 +58,7 @@ class GitManager:
         try:
             print_info("Cloning repository...")
             
-            run_command([
-                'git', 'clone', 
-                '--depth', '1',
-                '--single-branch',
-                '--no-tags',
-                github_url, 
-                str(repo_dir)
-            ], timeout=300)
+            self._clone(github_url, repo_dir)
             
             print_success("Repository ready")
             return repo_dir
@@ -77,6 +67,79 @@ class GitManager:
             self._force_cleanup(repo_dir)
             raise Exception(f"Failed to clone repository: {str(e)}")
     
+    def get_remote_head(self, github_url: str) -> Optional[str]:
+        """Resolve the remote HEAD commit without cloning (None if unreachable)"""
+        try:
+            result = run_command(
+                ['git', 'ls-remote', github_url, 'HEAD'],
+                capture_output=True,
+                timeout=30
+            )
+            output = result.stdout.strip()
+            return output.split()[0] if output else None
+        except Exception as e:
+            print_warning(f"Could not resolve remote HEAD: {e}")
+            return None
+    
+    def _clone(self, github_url: str, target_dir: Path) -> None:
+        """Check out the repository from the local mirror, falling back to a shallow clone"""
+        try:
+            mirror_dir = self._update_mirror(github_url)
+            
+            # --shared borrows objects from the mirror instead of copying them
+            run_command([
+                'git', 'clone',
+                '--shared',
+                '--no-tags',
+                str(mirror_dir),
+                str(target_dir)
+            ], timeout=120)
+            return
+            
+        except Exception as e:
+            print_warning(f"Mirror checkout failed, cloning directly: {e}")
+            self._force_cleanup(target_dir)
+        
+        run_command([
+            'git', 'clone', 
+            '--depth', '1',
+            '--single-branch',
+            '--no-tags',
+            github_url, 
+            str(target_dir)
+        ], timeout=300)
+    
+    def _update_mirror(self, github_url: str) -> Path:
+        """Create or incrementally fetch the bare mirror for a repository URL"""
+        normalized_url = github_url.rstrip('/')
+        key = hashlib.sha1(normalized_url.lower().encode('utf-8')).hexdigest()[:16]
+        mirror_dir = self.mirror_cache.entry_path(key)
+        
+        self.mirror_cache.expire(MIRROR_MAX_AGE_DAYS * 24 * 3600)
+        
+        if (mirror_dir / 'HEAD').exists():
+            print_info("Fetching new commits into local mirror...")
+            run_command([
+                'git', '--git-dir', str(mirror_dir),
+                'fetch', '--prune', '--no-tags', 'origin'
+            ], timeout=300)
+        else:
+            print_info("Creating local mirror (first deploy of this repository)...")
+            self._force_cleanup(mirror_dir)
+            run_command([
+                'git', 'clone', '--bare', '--no-tags',
+                normalized_url, str(mirror_dir)
+            ], timeout=600)
+            
+            # Bare clones have no fetch refspec - track all branches
+            run_command([
+                'git', '--git-dir', str(mirror_dir),
+                'config', 'remote.origin.fetch', '+refs/heads/*:refs/heads/*'
+            ], timeout=30)
+        
+        self.mirror_cache.commit(key, metadata={'url': normalized_url})
+        return mirror_dir
+    
     def cleanup_temp_dir(self, temp_dir: Path) -> None:
         """Clean up temporary directory"""
         self._schedule_cleanup(temp_dir)
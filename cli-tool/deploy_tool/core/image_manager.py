@@ -0,0 +1,169 @@
+import hashlib
+import re
+import shutil
+import subprocess
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from .cache_manager import CacheManager
+from .utils import print_info, print_success, print_warning, format_file_size, hash_file, clean_directory, FileEntry
+from ..config.constants import (
+    WORKSPACE_DIR_NAME, IMAGE_CACHE_MAX_BYTES, IMAGE_OPTIMIZER_VERSION,
+    IMAGE_OPTIMIZE_WORKERS, IMAGE_OPTIMIZE_TIMEOUT
+)
+
+# Lossless optimizers, first one found on PATH wins; {src}/{dst} are filled in.
+# Metadata is kept: EXIF orientation and ICC/colour chunks change how images render
+IMAGE_OPTIMIZERS = {
+    '.png': [
+        ['oxipng', '-o', '2', '--out', '{dst}', '{src}'],
+        ['optipng', '-quiet', '-o2', '-out', '{dst}', '{src}'],
+    ],
+    '.jpg': [
+        ['jpegtran', '-copy', 'all', '-optimize', '-progressive', '-outfile', '{dst}', '{src}'],
+    ],
+}
+IMAGE_OPTIMIZERS['.jpeg'] = IMAGE_OPTIMIZERS['.jpg']
+
+SVG_COMMENT_PATTERN = re.compile(rb'<!--.*?-->', re.DOTALL)
+SVG_METADATA_PATTERN = re.compile(rb'<metadata\b.*?</metadata>', re.DOTALL)
+# Only whitespace runs that contain a newline, so text content keeps its spaces
+SVG_INDENT_PATTERN = re.compile(rb'>\s*\n\s*<')
+# Elements whose whitespace is content: text layout, CSS, scripts and embedded HTML
+SVG_PRESERVE_PATTERN = re.compile(rb'<(text|style|script|foreignObject)\b.*?</\1\s*>', re.DOTALL)
+
+
+def _minify_markup(data: bytes) -> bytes:
+    """Minify a stretch of SVG markup that holds no whitespace-sensitive elements"""
+    data = SVG_COMMENT_PATTERN.sub(b'', data)
+    data = SVG_METADATA_PATTERN.sub(b'', data)
+    return SVG_INDENT_PATTERN.sub(b'><', data)
+
+
+def minify_svg(data: bytes) -> bytes:
+    """Strip comments, metadata and indentation from an SVG document, leaving rendered text intact"""
+    # xml:space can make whitespace significant on any element
+    if b'xml:space' in data:
+        return data
+
+    output = []
+    position = 0
+    for match in SVG_PRESERVE_PATTERN.finditer(data):
+        output.append(_minify_markup(data[position:match.start()]))
+        output.append(match.group(0))
+        position = match.end()
+    output.append(_minify_markup(data[position:]))
+    return b''.join(output).strip()
+
+
+class ImageManager:
+    """Lossless image recompression and SVG minification with a content-hash cache"""
+
+    def __init__(self, work_dir: Optional[Path] = None, max_workers: int = IMAGE_OPTIMIZE_WORKERS):
+        self.work_dir = work_dir or Path(tempfile.gettempdir()) / WORKSPACE_DIR_NAME
+        self.max_workers = max_workers
+        self.cache = CacheManager("images", IMAGE_CACHE_MAX_BYTES, self.work_dir)
+        self.optimizers = self._find_optimizers()
+
+    def _find_optimizers(self) -> Dict[str, Optional[List[str]]]:
+        """Pick the available optimizer command for each raster type"""
+        optimizers = {}
+        for suffix, candidates in IMAGE_OPTIMIZERS.items():
+            optimizers[suffix] = next((cmd for cmd in candidates if shutil.which(cmd[0])), None)
+        return optimizers
+
+    def supported_suffixes(self) -> List[str]:
+        """Image types that can be optimized on this machine"""
+        return ['.svg'] + [suffix for suffix, command in self.optimizers.items() if command]
+
+    def optimize(self, inventory: Sequence[FileEntry]) -> Dict:
+        """Optimize images of a build inventory in place and return a report"""
+        started = time.perf_counter()
+        suffixes = self.supported_suffixes()
+        images = [entry for entry in inventory if entry.suffix in suffixes]
+
+        missing = sorted({entry.suffix for entry in inventory if entry.suffix in IMAGE_OPTIMIZERS} - set(suffixes))
+        if missing:
+            print_info(f"No optimizer installed for {', '.join(missing)} (oxipng/optipng, jpegtran), skipping")
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(self._optimize_file, images))
+
+        # Evict once for the whole batch instead of per image
+        self.cache.evict()
+
+        changed = [r for r in results if r['bytes_saved'] > 0]
+        report = {
+            'files': len(results),
+            'optimized_files': len(changed),
+            'cached_files': sum(1 for r in results if r['cached']),
+            'bytes_saved': sum(r['bytes_saved'] for r in changed),
+            'seconds': round(time.perf_counter() - started, 3),
+            'changed': sorted(r['key'] for r in changed)
+        }
+
+        if results:
+            print_success(
+                f"Optimized {len(changed)}/{len(results)} images, saved {format_file_size(report['bytes_saved'])} "
+                f"({report['cached_files']} from cache, {report['seconds']}s)"
+            )
+
+        return report
+
+    def _cache_key(self, content_hash: str, suffix: str) -> str:
+        """Cache key for an image: content plus the optimizer that would process it"""
+        command = self.optimizers.get(suffix) or ['svg-minify']
+        signature = f"{content_hash}:{suffix}:{command[0]}:{IMAGE_OPTIMIZER_VERSION}"
+        return hashlib.sha256(signature.encode('utf-8')).hexdigest()
+
+    def _optimize_file(self, entry: FileEntry) -> Dict:
+        """Optimize a single image, reusing a cached result for identical content"""
+        result = {'key': entry.key, 'bytes_saved': 0, 'cached': False}
+
+        try:
+            cache_key = self._cache_key(hash_file(entry.path, 'sha256'), entry.suffix)
+            cached = self.cache.get(cache_key)
+
+            if cached is None:
+                cached = self._optimize_into_cache(entry, cache_key)
+            else:
+                result['cached'] = True
+
+            optimized = cached / 'image'
+            if optimized.exists():
+                # Copy rather than link: the build tree must not share inodes with the cache
+                shutil.copyfile(optimized, entry.path)
+                result['bytes_saved'] = entry.size - optimized.stat().st_size
+
+        except Exception as e:
+            print_warning(f"Could not optimize {entry.key}: {e}")
+
+        return result
+
+    def _optimize_into_cache(self, entry: FileEntry, cache_key: str) -> Path:
+        """Run the optimizer and cache its output (an empty entry records 'no gain')"""
+        staging = self.work_dir / "tmp" / f"image-{uuid.uuid4().hex[:12]}"
+        staging.mkdir(parents=True)
+
+        try:
+            output = staging / 'image'
+            if entry.suffix == '.svg':
+                output.write_bytes(minify_svg(entry.path.read_bytes()))
+            else:
+                command = [arg.format(src=entry.path, dst=output) for arg in self.optimizers[entry.suffix]]
+                subprocess.run(command, check=True, capture_output=True, timeout=IMAGE_OPTIMIZE_TIMEOUT)
+
+            if output.exists() and output.stat().st_size >= entry.size:
+                output.unlink()
+
+            return self.cache.put(
+                cache_key, staging,
+                metadata={'source': entry.key, 'original_size': entry.size},
+                evict=False
+            )
+        finally:
+            clean_directory(staging)
@@ -0,0 +1,243 @@
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+from .utils import print_info, print_success, print_warning, format_file_size, FileEntry
+from ..config.constants import (
+    REWRITE_PARALLEL_THRESHOLD, REWRITE_REPORT_SLOWEST, REWRITE_CHUNK_SIZE, REWRITE_MAX_TOKEN
+)
+
+# One scan handles every rule: absolute src/href/action attributes, CSS url()
+# references and <base> tags (removed, they break prefix hosting on S3)
+HTML_PATH_PATTERN = re.compile(
+    r'(?P<attr>(?:src|href|action)=")/(?=[^"]*")'
+    r'|(?P<base><base[^>]*/?>)'
+    r'|url\(/(?=[^)]*\))'
+)
+
+# Root-relative url() and @import references in stylesheets (not protocol-relative //)
+CSS_PATH_PATTERN = re.compile(rb'(url\(\s*["\']?|@import\s+["\'])/(?!/)')
+
+# Quoted root-relative paths in scripts; only rewritten when they name a build file
+JS_PATH_PATTERN = re.compile(
+    rb'(["\'`])/([A-Za-z0-9_\-.~@%%+/]{1,%d})\1' % (REWRITE_MAX_TOKEN - 3)
+)
+
+REWRITE_SUFFIXES = ('.html', '.css', '.js', '.mjs')
+
+# Build file keys, set once per worker process by _init_worker
+_known_keys: FrozenSet[str] = frozenset()
+
+
+def _init_worker(known_keys: FrozenSet[str]) -> None:
+    """Process pool initializer: share the build inventory without pickling it per task"""
+    global _known_keys
+    _known_keys = known_keys
+
+
+def _replace_html_path(match: re.Match) -> str:
+    """Replacement for a single HTML_PATH_PATTERN match"""
+    if match.group('attr'):
+        return f"{match.group('attr')}./"
+    if match.group('base'):
+        return ''
+    return 'url(./'
+
+
+def rewrite_html(content: str) -> Tuple[str, int]:
+    """Make absolute asset paths relative, returns (content, replacements)"""
+    return HTML_PATH_PATTERN.subn(_replace_html_path, content)
+
+
+def stream_rewrite(path: Path, pattern: re.Pattern, replace: Callable[[re.Match], bytes],
+                   chunk_size: int = REWRITE_CHUNK_SIZE, overlap: int = REWRITE_MAX_TOKEN) -> Tuple[int, int, int]:
+    """Apply a bytes pattern to a file in fixed-size chunks, returns (replacements, before, after)
+
+    Memory is bounded by chunk_size + overlap. Matches must be shorter than
+    overlap: the tail of each chunk is carried into the next one so a match
+    straddling a chunk boundary is still seen whole. The file is replaced
+    atomically and only if something changed.
+    """
+    temp_path = path.with_name(f".{path.name}.rewrite")
+    replacements = 0
+    before = 0
+    after = 0
+
+    try:
+        with open(path, 'rb') as src, open(temp_path, 'wb') as dst:
+            carry = b''
+            while True:
+                chunk = src.read(chunk_size)
+                before += len(chunk)
+                buffer = carry + chunk
+                # At EOF everything is final, otherwise hold back the overlap
+                cut = len(buffer) if not chunk else max(0, len(buffer) - overlap)
+                position = 0
+                output = []
+
+                for match in pattern.finditer(buffer):
+                    if match.start() >= cut:
+                        break
+                    replacement = replace(match)
+                    if replacement != match.group(0):
+                        replacements += 1
+                    output.append(buffer[position:match.start()])
+                    output.append(replacement)
+                    position = match.end()
+
+                end = max(position, cut)
+                output.append(buffer[position:end])
+                data = b''.join(output)
+                dst.write(data)
+                after += len(data)
+                carry = buffer[end:]
+
+                if not chunk:
+                    break
+
+        if replacements:
+            os.replace(temp_path, path)
+        return replacements, before, (after if replacements else before)
+    finally:
+        if temp_path.exists():
+            temp_path.unlink()
+
+
+def _rewrite_css(path: Path, key: str) -> Tuple[int, int, int]:
+    """Make root-relative stylesheet references relative to the stylesheet's own directory"""
+    prefix = ('../' * key.count('/') or './').encode('ascii')
+    return stream_rewrite(path, CSS_PATH_PATTERN, lambda match: match.group(1) + prefix)
+
+
+def _rewrite_js(path: Path, key: str) -> Tuple[int, int, int]:
+    """Make quoted absolute paths to build files document-relative"""
+    def replace(match: re.Match) -> bytes:
+        if match.group(2).decode('utf-8', 'ignore') not in _known_keys:
+            return match.group(0)
+        quote = match.group(1)
+        return quote + b'./' + match.group(2) + quote
+
+    return stream_rewrite(path, JS_PATH_PATTERN, replace)
+
+
+def rewrite_html_file(path: str) -> Dict:
+    """Rewrite a single HTML file in place"""
+    started = time.perf_counter()
+    result = {'path': path, 'changed': False, 'bytes_before': 0, 'bytes_after': 0, 'error': None}
+
+    try:
+        raw = Path(path).read_bytes()
+        content, replacements = rewrite_html(raw.decode('utf-8'))
+        result['bytes_before'] = result['bytes_after'] = len(raw)
+
+        if replacements:
+            encoded = content.encode('utf-8')
+            if encoded != raw:
+                Path(path).write_bytes(encoded)
+                result['changed'] = True
+                result['bytes_after'] = len(encoded)
+    except Exception as e:
+        result['error'] = str(e)
+
+    result['seconds'] = round(time.perf_counter() - started, 4)
+    return result
+
+
+def rewrite_file(item: Tuple[str, str]) -> Dict:
+    """Rewrite one build file by type (process pool worker), item is (path, key)"""
+    path, key = item
+    suffix = os.path.splitext(path)[1].lower()
+
+    if suffix == '.html':
+        result = rewrite_html_file(path)
+    else:
+        started = time.perf_counter()
+        result = {'path': path, 'changed': False, 'bytes_before': 0, 'bytes_after': 0, 'error': None}
+        try:
+            rewrite = _rewrite_css if suffix == '.css' else _rewrite_js
+            replacements, result['bytes_before'], result['bytes_after'] = rewrite(Path(path), key)
+            result['changed'] = replacements > 0
+        except Exception as e:
+            result['error'] = str(e)
+        result['seconds'] = round(time.perf_counter() - started, 4)
+
+    result['key'] = key
+    result['suffix'] = suffix
+    return result
+
+
+class RewriteManager:
+    """Rewrites absolute asset paths in build output, in parallel for large exports"""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def rewrite_files(self, inventory: Sequence[FileEntry], suffixes: Iterable[str] = REWRITE_SUFFIXES) -> Dict:
+        """Rewrite HTML, CSS and JS files of a build inventory and return a timing/bytes report"""
+        started = time.perf_counter()
+        suffixes = tuple(suffixes)
+        known_keys = frozenset(entry.key for entry in inventory)
+        items = [(str(entry.path), entry.key) for entry in inventory if entry.suffix in suffixes]
+        results = self._run(rewrite_file, items, known_keys)
+
+        changed = [r for r in results if r['changed']]
+        for result in results:
+            if result['error']:
+                print_warning(f"Could not fix {result['key']}: {result['error']}")
+            elif result['changed']:
+                print_info(
+                    f"Fixed paths in {result['key']} "
+                    f"({self._format_delta(result)}, {result['seconds'] * 1000:.1f}ms)"
+                )
+
+        return self._report(results, changed, time.perf_counter() - started)
+
+    def _run(self, worker, items: List[Tuple[str, str]], known_keys: FrozenSet[str]) -> List[Dict]:
+        """Map worker over items, using a process pool when it pays off"""
+        if len(items) < REWRITE_PARALLEL_THRESHOLD or self.max_workers < 2:
+            _init_worker(known_keys)
+            return [worker(item) for item in items]
+
+        try:
+            chunksize = max(1, len(items) // (self.max_workers * 4))
+            with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                     initargs=(known_keys,)) as executor:
+                return list(executor.map(worker, items, chunksize=chunksize))
+        except (OSError, RuntimeError) as e:
+            # Sandboxed environments may not allow worker processes
+            print_warning(f"Parallel rewrite unavailable ({e}), processing serially")
+            _init_worker(known_keys)
+            return [worker(item) for item in items]
+
+    @staticmethod
+    def _format_delta(result: Dict) -> str:
+        """Human readable size change of a rewritten file"""
+        delta = result['bytes_after'] - result['bytes_before']
+        sign = '+' if delta >= 0 else '-'
+        return f"{sign}{format_file_size(abs(delta))}"
+
+    def _report(self, results: List[Dict], changed: List[Dict], elapsed: float) -> Dict:
+        """Summarise a rewrite run"""
+        slowest = sorted(results, key=lambda r: r['seconds'], reverse=True)[:REWRITE_REPORT_SLOWEST]
+        report = {
+            'files': len(results),
+            'changed_files': len(changed),
+            'failed_files': sum(1 for r in results if r['error']),
+            'bytes_delta': sum(r['bytes_after'] - r['bytes_before'] for r in changed),
+            'seconds': round(elapsed, 3),
+            'changed': sorted(r['key'] for r in changed),
+            # CSS/JS whose bytes no longer match the fingerprint in their file names
+            'rewritten_assets': sorted(r['key'] for r in changed if r['suffix'] != '.html'),
+            'slowest': [{'path': r['key'], 'seconds': r['seconds']} for r in slowest]
+        }
+
+        if results:
+            print_success(
+                f"Fixed asset paths in {len(changed)}/{len(results)} files "
+                f"({report['bytes_delta']:+d} bytes, {report['seconds']}s)"
+            )
+
+        return report
@@ -0,0 +1,147 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from .utils import print_info, format_file_size
+from ..config.constants import (
+    DEFAULT_UPLOAD_CONCURRENCY, MAX_UPLOAD_CONCURRENCY,
+    TRANSFER_MAX_RETRIES, TRANSFER_RETRY_BACKOFF, TRANSFER_PROGRESS_INTERVAL
+)
+
+# S3 error codes that will not succeed on retry
+NON_RETRYABLE_ERRORS = {
+    'AccessDenied', 'AllAccessDisabled', 'InvalidAccessKeyId', 'ExpiredToken',
+    'NoSuchBucket', 'NoSuchKey', 'InvalidBucketName', 'SignatureDoesNotMatch'
+}
+
+
+class TransferTask(NamedTuple):
+    """Single unit of work for the transfer pool"""
+    name: str
+    size: int
+    action: Callable[[], Any]
+
+
+class TransferProgress:
+    """Thread-safe aggregate file/byte progress counter"""
+
+    def __init__(self, label: str, total_files: Optional[int] = None, total_bytes: Optional[int] = None):
+        self.label = label
+        self.total_files = total_files
+        self.total_bytes = total_bytes
+        self.files = 0
+        self.bytes = 0
+        self.started_at = time.monotonic()
+        self._last_report = self.started_at
+        self._lock = threading.Lock()
+
+    def add(self, size: int) -> None:
+        """Record a finished transfer and report progress periodically"""
+        with self._lock:
+            self.files += 1
+            self.bytes += size
+
+            now = time.monotonic()
+            finished = self.total_files is not None and self.files >= self.total_files
+            if finished or now - self._last_report >= TRANSFER_PROGRESS_INTERVAL:
+                self._last_report = now
+                print_info(self._format())
+
+    def _format(self) -> str:
+        """Format current progress line"""
+        files = f"{self.files}/{self.total_files}" if self.total_files is not None else str(self.files)
+        size = format_file_size(self.bytes)
+        if self.total_bytes:
+            size = f"{size}/{format_file_size(self.total_bytes)}"
+        return f"{self.label} {files} files ({size}, {format_file_size(self.throughput())}/s)"
+
+    def elapsed(self) -> float:
+        """Seconds since the counter was created"""
+        return time.monotonic() - self.started_at
+
+    def throughput(self) -> float:
+        """Average bytes per second so far"""
+        elapsed = self.elapsed()
+        return self.bytes / elapsed if elapsed > 0 else 0.0
+
+    def summary(self) -> Dict:
+        """Final counters for reporting"""
+        return {
+            'files': self.files,
+            'bytes': self.bytes,
+            'elapsed_seconds': round(self.elapsed(), 2),
+            'bytes_per_second': int(self.throughput())
+        }
+
+
+class TransferManager:
+    """Bounded worker pool for concurrent S3 transfers with per-task retries"""
+
+    def __init__(self, concurrency: int = DEFAULT_UPLOAD_CONCURRENCY, max_retries: int = TRANSFER_MAX_RETRIES):
+        self.concurrency = max(1, min(int(concurrency), MAX_UPLOAD_CONCURRENCY))
+        self.max_retries = max_retries
+
+    def run(self, tasks: Iterable[TransferTask], progress: TransferProgress) -> List[Any]:
+        """Run tasks on the pool and return their results
+
+        Tasks are pulled lazily so generators (e.g. paginated listings) start
+        transferring before they are exhausted. Stops submitting on first failure.
+        """
+        results = []
+        errors = []
+        max_in_flight = self.concurrency * 2
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            pending = set()
+
+            for task in tasks:
+                if len(pending) >= max_in_flight:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    self._collect(done, results, errors)
+                    if errors:
+                        break
+                pending.add(executor.submit(self._run_with_retry, task, progress))
+
+            done, _ = wait(pending)
+            self._collect(done, results, errors)
+
+        if errors:
+            raise Exception(f"{len(errors)} transfer(s) failed: {errors[0]}")
+
+        return results
+
+    def _collect(self, futures, results: List, errors: List) -> None:
+        """Gather results and errors from finished futures"""
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                errors.append(str(e))
+
+    def _run_with_retry(self, task: TransferTask, progress: TransferProgress) -> Any:
+        """Run a single task with exponential backoff"""
+        attempt = 0
+        while True:
+            try:
+                result = task.action()
+                break
+            except Exception as e:
+                attempt += 1
+                if attempt > self.max_retries or not self._is_retryable(e):
+                    raise Exception(f"{task.name}: {e}")
+                delay = TRANSFER_RETRY_BACKOFF * (2 ** (attempt - 1))
+                time.sleep(delay + random.uniform(0, delay))
+
+        progress.add(task.size)
+        return result
+
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        """Check whether an error is worth retrying"""
+        response = getattr(error, 'response', None)
+        if isinstance(response, dict):
+            code = response.get('Error', {}).get('Code')
+            return code not in NON_RETRYABLE_ERRORS
+        return True
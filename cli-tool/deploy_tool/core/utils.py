@@ -5,10 +5,11 @@ import shutil
 import subprocess
 import sys
 from pathlib import Path
-from typing import List, Optional, Dict
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
 import tempfile
 import json
 import re
+import hashlib
 
 # Initialize colorama
 init()
@@ -142,13 +143,57 @@ def format_file_size(size_bytes: int) -> str:
         size_bytes /= 1024.0
     return f"{size_bytes:.1f}TB"
 
-def get_directory_size(directory: Path) -> int:
+class FileEntry(NamedTuple):
+    """Immutable record of a single file found by scan_tree"""
+    path: Path
+    key: str       # path relative to the scanned root, '/'-separated
+    size: int
+    mtime: float
+    suffix: str    # lower-cased extension, e.g. '.html'
+
+def iter_tree(directory: Path) -> Iterator[FileEntry]:
+    """Walk a directory once with os.scandir, yielding files as they are found"""
+    if not directory.is_dir():
+        return
+    stack = [(str(directory), '')]
+    while stack:
+        dir_path, prefix = stack.pop()
+        with os.scandir(dir_path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((entry.path, f"{prefix}{entry.name}/"))
+                elif entry.is_file():
+                    stat = entry.stat()
+                    yield FileEntry(
+                        path=Path(entry.path),
+                        key=f"{prefix}{entry.name}",
+                        size=stat.st_size,
+                        mtime=stat.st_mtime,
+                        suffix=os.path.splitext(entry.name)[1].lower()
+                    )
+
+def scan_tree(directory: Path) -> Tuple[FileEntry, ...]:
+    """File inventory of a directory, sorted by key"""
+    return tuple(sorted(iter_tree(directory), key=lambda entry: entry.key))
+
+def refresh_entry(entry: FileEntry) -> FileEntry:
+    """Re-stat a file whose contents were changed after scanning"""
+    stat = entry.path.stat()
+    return entry._replace(size=stat.st_size, mtime=stat.st_mtime)
+
+def get_directory_size(directory: Path, inventory: Optional[Tuple[FileEntry, ...]] = None) -> int:
     """Get total size of directory in bytes"""
-    total_size = 0
-    for file_path in directory.rglob('*'):
-        if file_path.is_file():
-            total_size += file_path.stat().st_size
-    return total_size
+    if inventory is None:
+        inventory = iter_tree(directory)
+    return sum(entry.size for entry in inventory)
+
+def hash_file(file_path: Path, algorithm: str = 'md5', chunk_size: int = 1024 * 1024) -> str:
+    """Hash file contents in chunks (md5 matches S3 single-part ETags)"""
+    digest = hashlib.new(algorithm)
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
 
 def ensure_directory(directory: Path) -> None:
     """Ensure directory exists, create if it doesn't"""
@@ -183,6 +228,22 @@ def copy_directory_contents(src: Path, dst: Path) -> None:
             ensure_directory(destination_file.parent)
             shutil.copy2(item, destination_file)
 
+def link_tree(src: Path, dst: Path, exclude: Optional[List[str]] = None) -> None:
+    """Recreate a directory tree using hardlinks, copying where linking is not possible"""
+    def link_or_copy(src_file, dst_file):
+        try:
+            os.link(src_file, dst_file)
+        except OSError:
+            shutil.copy2(src_file, dst_file)
+        return dst_file
+    
+    shutil.copytree(
+        src, dst,
+        symlinks=True,
+        copy_function=link_or_copy,
+        ignore=shutil.ignore_patterns(*exclude) if exclude else None
+    )
+
 def get_file_size_mb(file_path: Path) -> float:
     """Get file size in megabytes"""
     return file_path.stat().st_size / (1024 * 1024)
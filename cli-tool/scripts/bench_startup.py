@@ -0,0 +1,82 @@
+"""
+Startup-time benchmark for the deploy-tool CLI
+
+Runs light commands in fresh interpreters and fails if they import the AWS SDK
+or exceed the time budget, so CI catches startup regressions.
+
+Usage: python scripts/bench_startup.py [--runs 10] [--max-ms 400]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+CLI_ROOT = Path(__file__).resolve().parent.parent
+
+# Commands CI scripts call many times; none of them should need the SDKs
+LIGHT_COMMANDS = [
+    ['--help'],
+    ['config', '--help'],
+    ['config', 'get', 'project.name'],
+]
+HEAVY_MODULES = ['boto3', 'botocore', 'requests']
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+from deploy_tool.cli import cli
+try:
+    cli.main(args=json.loads(sys.argv[1]), standalone_mode=False)
+except SystemExit:
+    pass
+elapsed = time.perf_counter() - started
+heavy = [name for name in json.loads(sys.argv[2]) if name in sys.modules]
+sys.stderr.write(json.dumps({'elapsed': elapsed, 'heavy': heavy}) + '\\n')
+"""
+
+
+def run_once(args):
+    """Run one command in a fresh interpreter, returns (wall seconds, in-process seconds, heavy modules)"""
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-c', PROBE, json.dumps(args), json.dumps(HEAVY_MODULES)],
+        cwd=CLI_ROOT, capture_output=True, text=True
+    )
+    wall = time.perf_counter() - started
+    report = json.loads(result.stderr.strip().splitlines()[-1])
+    return wall, report['elapsed'], report['heavy']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10, help='runs per command')
+    parser.add_argument('--max-ms', type=float, default=400, help='median wall-time budget per command')
+    options = parser.parse_args()
+
+    failures = []
+    for args in LIGHT_COMMANDS:
+        samples = [run_once(args) for _ in range(options.runs)]
+        wall_ms = statistics.median(sample[0] for sample in samples) * 1000
+        cli_ms = statistics.median(sample[1] for sample in samples) * 1000
+        heavy = sorted({name for sample in samples for name in sample[2]})
+
+        label = 'deploy-tool ' + ' '.join(args)
+        print(f"{label:<40} wall {wall_ms:7.1f}ms  import+run {cli_ms:7.1f}ms")
+
+        if heavy:
+            failures.append(f"{label}: imported {', '.join(heavy)}")
+        if wall_ms > options.max_ms:
+            failures.append(f"{label}: {wall_ms:.1f}ms exceeds {options.max_ms:.0f}ms budget")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -32,6 +32,9 @@ setup(
         "gitpython>=3.1.0",
         "colorama>=0.4.0",
     ],
+    extras_require={
+        "brotli": ["brotli>=1.0.0"],
+    },
     entry_points={
         "console_scripts": [
             "deploy-tool=deploy_tool.cli:cli",  
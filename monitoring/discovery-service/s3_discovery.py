@@ -4,29 +4,307 @@ Automatic S3 Deployment Discovery Service
 Continuously monitors S3 bucket for new deployments and updates monitoring targets
 """
 
+import os
 import time
+import hashlib
 import json
 import logging
+import threading
 import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from prometheus_client import Counter, Gauge, start_http_server
+from urllib.parse import unquote_plus
+from prometheus_client import Counter, Gauge, Histogram, start_http_server
 import requests
 
+# Version manifest written by deploy-tool next to each build, not part of the site
+MANIFEST_FILE = '.deploy-manifest.json'
+
 # Prometheus metrics for discovery service
 discovered_deployments = Gauge('discovered_deployments_total', 'Number of discovered deployments')
 discovery_errors = Counter('discovery_errors_total', 'Discovery service errors')
 last_discovery_time = Gauge('last_discovery_timestamp', 'Timestamp of last discovery run')
+discovery_events = Counter('discovery_events_total', 'S3 change events consumed', ['source'])
+incremental_updates = Counter('discovery_incremental_updates_total', 'Projects refreshed from change events')
+last_reconcile_time = Gauge('last_reconcile_timestamp', 'Timestamp of last full reconciliation')
+discovery_cycle_seconds = Histogram(
+    'discovery_cycle_duration_seconds', 'Duration of a full discovery cycle',
+    buckets=(0.25, 0.5, 1, 2, 5, 10, 20, 30, 60, 120)
+)
+project_scan_seconds = Histogram(
+    'discovery_project_scan_duration_seconds', 'Time to check a single project prefix',
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+)
+reload_requests = Counter(
+    'discovery_prometheus_reload_requests_total', 'Prometheus reload requests by outcome', ['outcome']
+)
+reload_failures = Counter('discovery_prometheus_reload_failures_total', 'Failed Prometheus reloads')
+reload_seconds = Histogram(
+    'discovery_prometheus_reload_duration_seconds', 'Latency of Prometheus /-/reload calls',
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 5)
+)
+metadata_cache_requests = Counter(
+    'discovery_metadata_cache_total', 'Conditional current.json reads by outcome', ['result']
+)
+
+
+def write_json_atomic(path, data, indent=2):
+    """Write JSON to a temp file and rename it over path, so readers never see a partial file"""
+    temp_path = path.with_name(f".{path.name}.tmp")
+    with open(temp_path, 'w') as f:
+        json.dump(data, f, indent=indent)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+def content_hash(data, volatile_keys=()):
+    """Hash of the JSON content, ignoring keys that change on every write"""
+    if isinstance(data, dict):
+        data = {key: value for key, value in data.items() if key not in volatile_keys}
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def project_from_key(key):
+    """Project whose live deployment an object key belongs to (None if irrelevant)"""
+    parts = key.split('/', 2)
+    if len(parts) < 2 or not parts[0]:
+        return None
+    # Only current/ objects and the current.json pointer change what is live
+    if parts[1] in ('current', 'current.json'):
+        return parts[0]
+    return None
+
+
+def keys_from_notification(body):
+    """Object keys from an S3 event notification (direct or wrapped in SNS)"""
+    message = json.loads(body) if isinstance(body, str) else body
+    if 'Message' in message and 'Records' not in message:
+        message = json.loads(message['Message'])
+
+    keys = []
+    for record in message.get('Records', []):
+        key = record.get('s3', {}).get('object', {}).get('key')
+        if key:
+            # Keys in S3 notifications are URL-encoded
+            keys.append(unquote_plus(key))
+    return keys
+
+
+class SQSEventSource:
+    """Reads S3 event notifications from an SQS queue"""
+
+    def __init__(self, queue_url, region):
+        self.queue_url = queue_url
+        self.sqs_client = boto3.client('sqs', region_name=region)
+        self.name = 'sqs'
+
+    def poll(self, timeout):
+        """Long-poll for events, returns (keys, receipt handles)"""
+        response = self.sqs_client.receive_message(
+            QueueUrl=self.queue_url,
+            MaxNumberOfMessages=10,
+            WaitTimeSeconds=max(0, min(20, int(timeout)))
+        )
+        keys = []
+        receipts = []
+        for message in response.get('Messages', []):
+            keys.extend(keys_from_notification(message['Body']))
+            receipts.append(message['ReceiptHandle'])
+        return keys, receipts
+
+    def ack(self, receipts):
+        """Delete processed messages"""
+        for start in range(0, len(receipts), 10):
+            self.sqs_client.delete_message_batch(
+                QueueUrl=self.queue_url,
+                Entries=[
+                    {'Id': str(index), 'ReceiptHandle': receipt}
+                    for index, receipt in enumerate(receipts[start:start + 10])
+                ]
+            )
+
+
+class FileEventSource:
+    """Local stand-in for the queue: tails a JSON-lines file of S3 notifications
+
+    Each line is an S3 event notification or a bare {"key": "..."} object,
+    e.g.  echo '{"key": "my-app/current.json"}' >> events.jsonl
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.offset = 0
+        self.name = 'file'
+
+    def poll(self, timeout):
+        """Return keys appended since the last poll, waiting up to timeout seconds"""
+        deadline = time.time() + timeout
+        while True:
+            keys = self._read_new_lines()
+            if keys or time.time() >= deadline:
+                return keys, []
+            time.sleep(min(1, max(0, deadline - time.time())))
+
+    def _read_new_lines(self):
+        """Parse lines written since the last read"""
+        if not self.path.exists():
+            return []
+        if self.path.stat().st_size < self.offset:
+            self.offset = 0  # file was truncated or rotated
+
+        keys = []
+        with open(self.path, 'r') as f:
+            f.seek(self.offset)
+            for line in f:
+                if not line.endswith('\n'):
+                    break  # partial line, read again next time
+                self.offset += len(line.encode('utf-8'))
+                line = line.strip()
+                if not line:
+                    continue
+                event = json.loads(line)
+                keys.extend([event['key']] if 'key' in event else keys_from_notification(event))
+        return keys
+
+    def ack(self, receipts):
+        """Nothing to acknowledge for files"""
+        pass
+
+
+class PrometheusReloader:
+    """Debounced Prometheus reloads, sent only when the main config changed
+
+    Target changes never need a reload, file_sd_configs re-reads the targets
+    file by itself. Requests within the debounce window coalesce into one
+    config check, and a steady stream of requests waits at most max_delay.
+    """
+
+    def __init__(self, url, config_files, debounce=10, max_delay=60):
+        self.url = url.rstrip('/')
+        self.config_files = [Path(path) for path in config_files]
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.logger = logging.getLogger(__name__)
+
+        self.condition = threading.Condition()
+        self.first_request = None
+        self.last_request = None
+
+        # Prometheus loaded whatever was on disk when it started
+        self.loaded_hash = self._config_hash()
+
+        self.thread = threading.Thread(target=self._run, name='prometheus-reload', daemon=True)
+        self.thread.start()
+
+    def request(self):
+        """Ask for a reload check, merged with any request already pending"""
+        with self.condition:
+            now = time.monotonic()
+            if self.first_request is None:
+                self.first_request = now
+            else:
+                reload_requests.labels(outcome='coalesced').inc()
+            self.last_request = now
+            self.condition.notify()
+
+    def _run(self):
+        """Wait for the debounce window to go quiet, then check and reload"""
+        while True:
+            with self.condition:
+                while self.first_request is None:
+                    self.condition.wait()
+
+                while True:
+                    due = min(self.last_request + self.debounce, self.first_request + self.max_delay)
+                    remaining = due - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.condition.wait(remaining)
+
+                self.first_request = None
+                self.last_request = None
+
+            try:
+                self.reload_if_changed()
+            except Exception as e:
+                self.logger.error(f"Prometheus reload check failed: {e}")
+
+    def _config_hash(self):
+        """Hash of the main config and rule files (missing files hash as absent)"""
+        digest = hashlib.sha256()
+        for path in self.config_files:
+            digest.update(str(path).encode('utf-8'))
+            try:
+                digest.update(path.read_bytes())
+            except OSError:
+                digest.update(b'\0missing')
+        return digest.hexdigest()
+
+    def reload_if_changed(self):
+        """Reload Prometheus if its config changed since the last successful reload"""
+        config_hash = self._config_hash()
+        if config_hash == self.loaded_hash:
+            reload_requests.labels(outcome='skipped').inc()
+            self.logger.debug("Prometheus config unchanged, reload skipped")
+            return False
+
+        if self.reload():
+            self.loaded_hash = config_hash
+            return True
+        # loaded_hash stays stale, so the next request retries
+        return False
+
+    def reload(self):
+        """Trigger Prometheus configuration reload"""
+        started = time.perf_counter()
+        try:
+            # Send reload signal to Prometheus
+            response = requests.post(f"{self.url}/-/reload", timeout=5)
+            success = response.status_code == 200
+            if success:
+                self.logger.info("Prometheus configuration reloaded successfully")
+            else:
+                self.logger.warning(f"Prometheus reload returned status: {response.status_code}")
+        except Exception as e:
+            success = False
+            self.logger.error(f"Failed to reload Prometheus config: {e}")
+        finally:
+            reload_seconds.observe(time.perf_counter() - started)
+
+        if not success:
+            reload_failures.inc()
+        reload_requests.labels(outcome='reloaded' if success else 'failed').inc()
+        return success
+
 
 class S3DeploymentDiscovery:
-    def __init__(self, bucket_name, region, targets_dir='/opt/monitoring/targets'):
+    def __init__(self, bucket_name, region, targets_dir='/opt/monitoring/targets', scan_workers=16,
+                 cache_file=None, backup_count=10, prometheus_url='http://prometheus:9090',
+                 prometheus_config_files=('/etc/prometheus/prometheus.yml', '/etc/prometheus/alert_rules.yml'),
+                 reload_debounce=10):
         self.bucket_name = bucket_name
         self.region = region
         self.targets_dir = Path(targets_dir)
         self.targets_dir.mkdir(exist_ok=True)
+        self.backup_count = backup_count
+
+        # Content hash of each file last written, to skip identical rewrites
+        self.file_hashes = {}
+
+        self.reloader = PrometheusReloader(prometheus_url, prometheus_config_files, debounce=reload_debounce)
+
+        # Initialize AWS client, one pooled connection per scan worker
+        self.s3_client = boto3.client(
+            's3', region_name=region,
+            config=Config(max_pool_connections=max(10, scan_workers))
+        )
 
-        # Initialize AWS client
-        self.s3_client = boto3.client('s3', region_name=region)
+        # Project checks are I/O bound, a thread pool overlaps their round-trips
+        self.executor = ThreadPoolExecutor(max_workers=scan_workers, thread_name_prefix='discovery-scan')
 
         # Setup logging
         logging.basicConfig(
@@ -37,39 +315,121 @@ class S3DeploymentDiscovery:
 
         # Track previous discoveries for change detection
         self.previous_deployments = set()
+        # Deployment entries as last written to the targets files
+        self.published_deployments = {}
+        self.deployments = {}
+
+        # current.json ETag, parsed pointer and derived info per project, kept
+        # across restarts so unchanged projects cost a 304 from the first cycle
+        self.cache_file = Path(cache_file) if cache_file else self.targets_dir / '.discovery_cache.json'
+        self.cache_lock = threading.Lock()
+        self.metadata_cache = self._load_metadata_cache()
+        self.cache_dirty = False
 
     def discover_and_update(self):
         """Main discovery and update cycle"""
+        started = time.perf_counter()
         try:
             self.logger.info("Starting S3 deployment discovery...")
 
             # Discover active deployments
             deployments = self.discover_deployments()
+            self.deployments = {dep['project']: dep for dep in deployments}
 
             # Check for changes
             current_deployments = {dep['project'] for dep in deployments}
 
-            if current_deployments != self.previous_deployments:
+            # Compare whole entries, so a changed deployment whose event was missed is fixed here
+            if self.deployments != self.published_deployments:
                 self.logger.info(f"Deployment changes detected. New: {current_deployments - self.previous_deployments}, Removed: {self.previous_deployments - current_deployments}")
+                self.publish_deployments()
 
-                # Update monitoring targets
-                self.update_prometheus_targets(deployments)
-                self.update_grafana_variables(deployments)
-
-                # Trigger Prometheus reload
-                self.reload_prometheus_config()
-
-                self.previous_deployments = current_deployments
+            # Picks up edits to prometheus.yml or its rules, a no-op otherwise
+            self.reload_prometheus_config()
 
             # Update metrics
             discovered_deployments.set(len(deployments))
             last_discovery_time.set(time.time())
 
-            self.logger.info(f"Discovery complete. Found {len(deployments)} active deployments")
+            self.logger.info(f"Discovery complete. Found {len(deployments)} active deployments in {time.perf_counter() - started:.2f}s")
 
         except Exception as e:
             discovery_errors.inc()
             self.logger.error(f"Discovery error: {e}")
+        finally:
+            discovery_cycle_seconds.observe(time.perf_counter() - started)
+
+    def publish_deployments(self):
+        """Write targets and variables for the known deployments and reload Prometheus"""
+        deployments = [self.deployments[project] for project in sorted(self.deployments)]
+
+        # Update monitoring targets, file_sd_configs picks them up without a reload
+        self.update_prometheus_targets(deployments)
+        self.update_grafana_variables(deployments)
+
+        self.previous_deployments = set(self.deployments)
+        self.published_deployments = dict(self.deployments)
+
+    def refresh_projects(self, projects):
+        """Re-check only the given projects and publish if anything changed"""
+        projects = sorted(projects)
+
+        for project_name, current in zip(projects, self.executor.map(self._scan_project, projects)):
+            previous = self.deployments.get(project_name)
+            if current:
+                self.deployments[project_name] = current
+            else:
+                self.deployments.pop(project_name, None)
+
+            incremental_updates.inc()
+            if current != previous:
+                self.logger.info(f"Deployment {'updated' if current else 'removed'}: {project_name}")
+
+        self._save_metadata_cache()
+
+        # Against what was published, not the previous scan, so nothing is left unpublished
+        if self.deployments != self.published_deployments:
+            self.publish_deployments()
+
+        discovered_deployments.set(len(self.deployments))
+        last_discovery_time.set(time.time())
+
+    def run_event_discovery(self, event_source, reconcile_interval=300):
+        """Apply S3 change events as they arrive, with periodic full reconciliation
+
+        Events only name keys, so each batch costs API calls per affected
+        project rather than per project in the bucket. The full scan catches
+        anything the queue dropped.
+        """
+        self.logger.info(f"Starting event-driven discovery from {event_source.name}")
+        self.logger.info(f"Full reconciliation every {reconcile_interval} seconds")
+
+        self.discover_and_update()
+        next_reconcile = time.time() + reconcile_interval
+        last_reconcile_time.set(time.time())
+
+        while True:
+            try:
+                keys, receipts = event_source.poll(timeout=max(1, next_reconcile - time.time()))
+                discovery_events.labels(source=event_source.name).inc(len(keys))
+
+                projects = {project for project in map(project_from_key, keys) if project}
+                if projects:
+                    self.refresh_projects(projects)
+                event_source.ack(receipts)
+
+                if time.time() >= next_reconcile:
+                    self.discover_and_update()
+                    next_reconcile = time.time() + reconcile_interval
+                    last_reconcile_time.set(time.time())
+
+            except KeyboardInterrupt:
+                self.logger.info("Discovery service stopped by user")
+                break
+            except Exception as e:
+                discovery_errors.inc()
+                self.logger.error(f"Unexpected error in event loop: {e}")
+                time.sleep(5)
 
     def discover_deployments(self):
         """Discover all current deployments in S3"""
@@ -84,28 +444,61 @@ class S3DeploymentDiscovery:
                 Delimiter='/'
             )
 
+            project_names = []
             for page in pages:
                 for prefix in page.get('CommonPrefixes', []):
                     project_name = prefix['Prefix'].rstrip('/')
 
                     # Skip if empty project name
-                    if not project_name:
-                        continue
-
-                    # Check if project has a current deployment
-                    if self._has_current_deployment(project_name):
-                        deployment_info = self._get_deployment_info(project_name)
-                        deployments.append(deployment_info)
-                        self.logger.debug(f"Discovered deployment: {project_name}")
+                    if project_name:
+                        project_names.append(project_name)
+
+            # Check all projects concurrently, bounded by the pool size
+            for deployment_info in self.executor.map(self._scan_project, project_names):
+                if deployment_info:
+                    deployments.append(deployment_info)
+                    self.logger.debug(f"Discovered deployment: {deployment_info['project']}")
+
+            # Forget projects that no longer exist in the bucket
+            with self.cache_lock:
+                for project_name in set(self.metadata_cache) - set(project_names):
+                    del self.metadata_cache[project_name]
+                    self.cache_dirty = True
+            self._save_metadata_cache()
 
         except Exception as e:
             self.logger.error(f"Error discovering deployments: {e}")
 
         return deployments
 
-    def _has_current_deployment(self, project_name):
+    def _scan_project(self, project_name):
+        """Deployment info for a project, or None if nothing is live (runs in the scan pool)"""
+        with project_scan_seconds.time():
+            pointer = self._get_pointer(project_name)
+
+            # Unchanged pointer: reuse what was derived from it last time
+            cached = self.metadata_cache.get(project_name)
+            if pointer and cached and cached.get('info'):
+                return cached['info']
+
+            if not self._has_current_deployment(project_name, pointer):
+                return None
+            info = self._get_deployment_info(project_name, pointer)
+
+            # Summaries only change with the pointer, listing-based info can drift
+            if pointer and pointer.get('summary') and cached:
+                with self.cache_lock:
+                    cached['info'] = info
+                    self.cache_dirty = True
+            return info
+
+    def _has_current_deployment(self, project_name, pointer=None):
         """Check if project has a current deployment"""
         try:
+            # Pointer-mode projects have a current.json but no current/ objects
+            if pointer:
+                return True
+
             response = self.s3_client.list_objects_v2(
                 Bucket=self.bucket_name,
                 Prefix=f"{project_name}/current/",
@@ -116,25 +509,90 @@ class S3DeploymentDiscovery:
             self.logger.error(f"Error checking current deployment for {project_name}: {e}")
             return False
 
-    def _get_deployment_info(self, project_name):
+    def _get_pointer(self, project_name):
+        """Read the project's current.json pointer written by deploy-tool, conditional on the cached ETag"""
+        cached = self.metadata_cache.get(project_name)
+        request = {'Bucket': self.bucket_name, 'Key': f"{project_name}/current.json"}
+        if cached:
+            request['IfNoneMatch'] = cached['etag']
+
+        try:
+            response = self.s3_client.get_object(**request)
+            pointer = json.loads(response['Body'].read())
+        except ClientError as e:
+            code = e.response.get('Error', {}).get('Code')
+            if cached and code in ('304', 'NotModified'):
+                metadata_cache_requests.labels(result='hit').inc()
+                return cached['pointer']
+            if code in ('NoSuchKey', '404'):
+                self._forget_metadata(project_name)
+            else:
+                self.logger.debug(f"No pointer for {project_name}: {e}")
+            return None
+        except Exception as e:
+            self.logger.debug(f"No pointer for {project_name}: {e}")
+            return None
+
+        metadata_cache_requests.labels(result='miss').inc()
+        with self.cache_lock:
+            self.metadata_cache[project_name] = {'etag': response['ETag'], 'pointer': pointer, 'info': None}
+            self.cache_dirty = True
+        return pointer
+
+    def _forget_metadata(self, project_name):
+        """Drop a project's cached pointer"""
+        with self.cache_lock:
+            if self.metadata_cache.pop(project_name, None) is not None:
+                self.cache_dirty = True
+
+    def _load_metadata_cache(self):
+        """Load the persisted pointer cache (empty if missing, corrupt or for another bucket)"""
+        try:
+            with open(self.cache_file, 'r') as f:
+                data = json.load(f)
+            if data.get('bucket') == self.bucket_name:
+                return data.get('projects', {})
+        except (OSError, ValueError, AttributeError):
+            pass
+        return {}
+
+    def _save_metadata_cache(self):
+        """Persist the pointer cache if it changed, atomically"""
+        with self.cache_lock:
+            if not self.cache_dirty:
+                return
+            data = {'bucket': self.bucket_name, 'projects': self.metadata_cache}
+            try:
+                write_json_atomic(self.cache_file, data, indent=None)
+                self.cache_dirty = False
+            except OSError as e:
+                self.logger.warning(f"Could not save discovery cache: {e}")
+
+    def _get_deployment_info(self, project_name, pointer=None):
         """Get detailed deployment information"""
         deployment_url = f"http://{self.bucket_name}.s3-website.{self.region}.amazonaws.com/{project_name}/current/"
+        pointer = pointer or {}
+
+        # deploy-tool writes a summary into current.json at activation, so this is usually free
+        summary = pointer.get('summary')
+        if summary:
+            return {
+                'project': project_name,
+                'url': deployment_url,
+                'file_count': summary.get('file_count', 0),
+                'total_size': summary.get('total_size', 0),
+                'last_modified': summary.get('last_modified') or pointer.get('activated_at') or datetime.now().isoformat(),
+                'framework': summary.get('framework', 'unknown'),
+                'monitor_type': 'website'
+            }
 
         # Get deployment metadata
         try:
-            response = self.s3_client.list_objects_v2(
-                Bucket=self.bucket_name,
-                Prefix=f"{project_name}/current/"
+            # Pointer-mode projects serve current/ straight from the version prefix
+            file_count, total_size, last_modified, framework = self._aggregate_prefix(
+                pointer.get('prefix', f"{project_name}/current/")
             )
 
-            contents = response.get('Contents', [])
-            file_count = len(contents)
-            total_size = sum(obj['Size'] for obj in contents)
-            last_modified = max(obj['LastModified'] for obj in contents) if contents else datetime.now()
-
-            # Detect framework type from file extensions
-            framework = self._detect_framework(contents)
-
         except Exception as e:
             self.logger.error(f"Error getting deployment info for {project_name}: {e}")
             file_count = 0
@@ -152,21 +610,55 @@ class S3DeploymentDiscovery:
             'monitor_type': 'website'
         }
 
-    def _detect_framework(self, contents):
-        """Detect framework type from deployment files"""
-        filenames = [obj['Key'].split('/')[-1] for obj in contents]
-
+    def _aggregate_prefix(self, prefix):
+        """Count, size, newest timestamp and framework of all objects under prefix, page by page"""
+        file_count = 0
+        total_size = 0
+        last_modified = None
+        signals = set()
+
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix):
+            contents = [obj for obj in page.get('Contents', []) if not obj['Key'].endswith(f"/{MANIFEST_FILE}")]
+            file_count += len(contents)
+            total_size += sum(obj['Size'] for obj in contents)
+            if contents:
+                newest = max(obj['LastModified'] for obj in contents)
+                last_modified = newest if last_modified is None else max(last_modified, newest)
+            signals |= self._framework_signals(contents)
+
+        return file_count, total_size, last_modified or datetime.now(), self._detect_framework(signals)
+
+    def _framework_signals(self, contents):
+        """File name hints used by _detect_framework, collected per listing page"""
+        signals = set()
+        for obj in contents:
+            filename = obj['Key'].split('/')[-1]
+            if 'chunk' in filename:
+                signals.add('chunk')
+            if filename.endswith('.js'):
+                signals.add('js')
+                if filename.startswith('main.'):
+                    signals.add('main')
+                if filename.startswith('app.'):
+                    signals.add('app')
+            if '_next' in obj['Key']:
+                signals.add('next')
+        return signals
+
+    def _detect_framework(self, signals):
+        """Detect framework type from deployment file signals"""
         # React/Vite detection
-        if any('chunk' in f for f in filenames) and any(f.endswith('.js') for f in filenames):
+        if 'chunk' in signals and 'js' in signals:
             return 'react'
         # Next.js detection
-        elif any('_next' in obj['Key'] for obj in contents):
+        elif 'next' in signals:
             return 'nextjs'
         # Angular detection
-        elif any(f.startswith('main.') and f.endswith('.js') for f in filenames):
+        elif 'main' in signals:
             return 'angular'
         # Vue detection
-        elif any(f.startswith('app.') and f.endswith('.js') for f in filenames):
+        elif 'app' in signals:
             return 'vue'
         else:
             return 'static'
@@ -190,15 +682,50 @@ class S3DeploymentDiscovery:
 
         # Write targets file for Prometheus file service discovery
         target_file = self.targets_dir / 'auto_discovered_websites.json'
-        with open(target_file, 'w') as f:
-            json.dump(targets, f, indent=2)
+        if not self._write_if_changed(target_file, targets):
+            self.logger.info(f"Prometheus targets unchanged: {len(targets)} websites")
+            return False
 
         self.logger.info(f"Updated Prometheus targets: {len(targets)} websites")
 
-        # Also create a backup with timestamp
+        # Also create a backup with timestamp, keeping only the newest few
         backup_file = self.targets_dir / f'targets_backup_{int(time.time())}.json'
-        with open(backup_file, 'w') as f:
-            json.dump(targets, f, indent=2)
+        write_json_atomic(backup_file, targets)
+        self._rotate_backups()
+        return True
+
+    def _write_if_changed(self, path, data, volatile_keys=()):
+        """Atomically write JSON unless the file already holds the same content, returns True if written"""
+        digest = content_hash(data, volatile_keys)
+
+        if path not in self.file_hashes and path.exists():
+            # First write since startup: compare against what is on disk
+            try:
+                with open(path, 'r') as f:
+                    self.file_hashes[path] = content_hash(json.load(f), volatile_keys)
+            except (OSError, ValueError):
+                pass
+
+        if self.file_hashes.get(path) == digest:
+            return False
+
+        write_json_atomic(path, data)
+        self.file_hashes[path] = digest
+        return True
+
+    def _rotate_backups(self):
+        """Delete all but the newest backup_count target backups"""
+        backups = []
+        for backup_file in self.targets_dir.glob('targets_backup_*.json'):
+            stamp = backup_file.stem[len('targets_backup_'):]
+            if stamp.isdigit():
+                backups.append((int(stamp), backup_file))
+
+        for _, backup_file in sorted(backups, reverse=True)[self.backup_count:]:
+            try:
+                backup_file.unlink()
+            except OSError as e:
+                self.logger.warning(f"Could not remove old backup {backup_file.name}: {e}")
 
     def update_grafana_variables(self, deployments):
         """Update Grafana dashboard variables"""
@@ -215,22 +742,15 @@ class S3DeploymentDiscovery:
         }
 
         variables_file = self.targets_dir / 'grafana_variables.json'
-        with open(variables_file, 'w') as f:
-            json.dump(variables_data, f, indent=2)
+        if not self._write_if_changed(variables_file, variables_data, volatile_keys=('last_updated',)):
+            return False
 
         self.logger.info(f"Updated Grafana variables: {len(projects)} projects, {len(frameworks)} frameworks")
+        return True
 
     def reload_prometheus_config(self):
-        """Trigger Prometheus configuration reload"""
-        try:
-            # Send reload signal to Prometheus
-            response = requests.post('http://prometheus:9090/-/reload', timeout=5)
-            if response.status_code == 200:
-                self.logger.info("Prometheus configuration reloaded successfully")
-            else:
-                self.logger.warning(f"Prometheus reload returned status: {response.status_code}")
-        except Exception as e:
-            self.logger.error(f"Failed to reload Prometheus config: {e}")
+        """Request a debounced Prometheus reload (sent only if its config changed)"""
+        self.reloader.request()
 
     def run_continuous_discovery(self, interval=60):
         """Run continuous discovery service"""
@@ -260,11 +780,28 @@ def main():
     # Initialize discovery service
     discovery = S3DeploymentDiscovery(
         bucket_name='minfy-uzaif-capstone-deployments',
-        region='ap-south-1'
+        region='ap-south-1',
+        scan_workers=int(os.environ.get('DISCOVERY_SCAN_WORKERS', '16')),
+        backup_count=int(os.environ.get('DISCOVERY_BACKUP_COUNT', '10')),
+        prometheus_url=os.environ.get('PROMETHEUS_URL', 'http://prometheus:9090'),
+        prometheus_config_files=os.environ.get(
+            'PROMETHEUS_CONFIG_FILES', '/etc/prometheus/prometheus.yml,/etc/prometheus/alert_rules.yml'
+        ).split(','),
+        reload_debounce=float(os.environ.get('DISCOVERY_RELOAD_DEBOUNCE', '10'))
     )
 
-    # Run continuous discovery
-    discovery.run_continuous_discovery(interval=30)
+    # Event-driven when a queue (or local events file) is configured, polling otherwise
+    queue_url = os.environ.get('DISCOVERY_QUEUE_URL')
+    events_file = os.environ.get('DISCOVERY_EVENTS_FILE')
+    reconcile_interval = int(os.environ.get('DISCOVERY_RECONCILE_INTERVAL', '300'))
+
+    if queue_url:
+        discovery.run_event_discovery(SQSEventSource(queue_url, discovery.region), reconcile_interval)
+    elif events_file:
+        discovery.run_event_discovery(FileEventSource(events_file), reconcile_interval)
+    else:
+        # Run continuous discovery
+        discovery.run_continuous_discovery(interval=30)
 
 if __name__ == '__main__':
     main()